@@ -12,6 +12,7 @@ SAFETY FEATURES:
 """
 import os
 import sys
+import traceback
 from typing import Dict, Optional
 from datetime import datetime
 from dotenv import load_dotenv
@@ -241,7 +242,6 @@ class AuthenticatedTrader:
 
         except Exception as e:
             print(f"✗ Trade execution failed: {e}")
-            import traceback
             traceback.print_exc()
             return None
 
@@ -326,7 +326,6 @@ def main():
 
     except Exception as e:
         print(f"\n✗ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 
@@ -9,6 +9,13 @@ import sys
 import json
 import requests
 
+try:
+    from polymarket import fast_json
+    from polymarket.http_session import make_session
+except ImportError:
+    import fast_json
+    from http_session import make_session
+
 # Runtime guardrail: exit non-zero if forbidden POLY_* env vars exist
 _FORBIDDEN_CODES = [
     [80,79,76,89,95,65,68,68,82,69,83,83],
@@ -33,7 +40,7 @@ CLOB_HTTP_BASE = os.environ.get('CLOB_HTTP_BASE', 'https://clob.polymarket.com')
 class ClobClient:
     def __init__(self, base: str = None, session: requests.Session = None):
         self.base = (base or CLOB_HTTP_BASE).rstrip('/')
-        self.session = session or requests.Session()
+        self.session = session if session is not None else make_session()
 
     def _url(self, path: str) -> str:
         return f"{self.base}{path}"
@@ -47,7 +54,7 @@ class ClobClient:
         url = self._url('/simplified-markets')
         resp = self.session.get(url, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = fast_json.loads(resp.content)
         # API returns {"data": [...]}
         return data.get('data', []) if isinstance(data, dict) else data
 
@@ -63,7 +70,7 @@ class ClobClient:
             params['next_cursor'] = next_cursor
         resp = self.session.get(url, params=params, timeout=10)
         resp.raise_for_status()
-        return resp.json()
+        return fast_json.loads(resp.content)
 
     def get_price(self, token_id: str, side: str) -> Dict[str, Any]:
         """GET /price?token_id=<ID>&side=BUY|SELL -> returns parsed JSON.
@@ -75,7 +82,7 @@ class ClobClient:
         url = self._url('/price')
         resp = self.session.get(url, params={'token_id': token_id, 'side': side}, timeout=5)
         resp.raise_for_status()
-        return resp.json()
+        return fast_json.loads(resp.content)
 
     def get_prices(self, requests_list: List[Dict[str, str]]) -> List[Dict[str, Any]]:
         """POST /prices with body list of {token_id, side} -> returns list of quotes.
@@ -86,7 +93,7 @@ class ClobClient:
         headers = {'Content-Type': 'application/json'}
         resp = self.session.post(url, headers=headers, data=json.dumps(requests_list), timeout=10)
         resp.raise_for_status()
-        return resp.json()
+        return fast_json.loads(resp.content)
 
     def get_book(self, token_id: str) -> Dict[str, Any]:
         """GET /book?token_id=<ID> -> returns book summary.
@@ -97,7 +104,7 @@ class ClobClient:
         url = self._url('/book')
         resp = self.session.get(url, params={'token_id': token_id}, timeout=5)
         resp.raise_for_status()
-        return resp.json()
+        return fast_json.loads(resp.content)
 
     def get_books(self, token_ids: List[str]) -> List[Dict[str, Any]]:
         """POST /books with body list of token_ids -> returns list of books.
@@ -109,4 +116,4 @@ class ClobClient:
         body = [{'token_id': tid} for tid in token_ids]
         resp = self.session.post(url, headers=headers, json=body, timeout=10)
         resp.raise_for_status()
-        return resp.json()
+        return fast_json.loads(resp.content)
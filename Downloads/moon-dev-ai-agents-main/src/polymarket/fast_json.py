@@ -0,0 +1,30 @@
+"""JSON encode/decode helpers that use orjson when it is installed.
+
+orjson is optional (pip install orjson). Without it these fall back to the
+stdlib json module with the same return types:
+ - dumps(obj, indent=False) -> UTF-8 encoded bytes
+ - loads(data) -> parsed object, accepting bytes or str
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialize obj to JSON bytes (2-space indented if indent=True)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    loads = orjson.loads
+else:
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialize obj to JSON bytes (2-space indented if indent=True)."""
+        if indent:
+            return json.dumps(obj, indent=2).encode()
+        # Match orjson's compact output (no space after ',' and ':')
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    loads = json.loads
@@ -11,13 +11,20 @@ import os
 import requests
 from datetime import datetime
 
+try:
+    from polymarket import fast_json
+    from polymarket.http_session import make_session
+except ImportError:
+    import fast_json
+    from http_session import make_session
+
 GAMMA_API_BASE = os.environ.get("GAMMA_API_BASE", "https://gamma-api.polymarket.com").rstrip('/')
 
 
 class GammaClient:
     def __init__(self, base: Optional[str] = None, session: Optional[requests.Session] = None):
         self.base = (base or GAMMA_API_BASE).rstrip('/')
-        self.session = session or requests.Session()
+        self.session = session if session is not None else make_session()
 
     def _url(self, path: str) -> str:
         return f"{self.base}{path}"
@@ -38,7 +45,7 @@ class GammaClient:
 
         resp = self.session.get(url, params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = fast_json.loads(resp.content)
 
         # Handle both list and dict responses
         raw_markets = data if isinstance(data, list) else (data.get('data', []) if isinstance(data, dict) else [])
@@ -48,9 +55,8 @@ class GammaClient:
             # Parse clobTokenIds from string to list if needed
             clob_tokens = m.get('clobTokenIds')
             if isinstance(clob_tokens, str):
-                import json
                 try:
-                    clob_tokens = json.loads(clob_tokens)
+                    clob_tokens = fast_json.loads(clob_tokens)
                 except:
                     clob_tokens = None
 
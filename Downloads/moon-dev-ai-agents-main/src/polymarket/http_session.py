@@ -0,0 +1,12 @@
+"""Shared requests.Session setup for the Polymarket HTTP clients."""
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def make_session(pool_size: int = 32) -> requests.Session:
+    """Return a Session whose keep-alive pool fits concurrent callers sharing it."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -0,0 +1,180 @@
+"""Background market snapshot feed (public, read-only).
+
+Keeps a warm, in-process snapshot of open Gamma markets so a trading loop
+can read market data without waiting on an HTTP round trip each cycle.
+
+Usage:
+    feed = MarketFeed(GammaClient(), refresh_interval=30)
+    feed.start()
+    markets = feed.get_markets()
+    ...
+    feed.stop()
+"""
+from typing import Dict, Any, List, Optional
+import os
+import sys
+import threading
+import time
+
+
+class MarketFeed:
+    """Refreshes the open-market list on a daemon thread and caches it by id.
+
+    The first get_markets() call before any refresh has completed fetches
+    synchronously (cold start). Refresh errors are retried with exponential
+    backoff while the last good snapshot keeps being served.
+    """
+
+    def __init__(self, gamma, refresh_interval: float = 30, limit: int = 10000,
+                 max_backoff: float = 300, cpu: Optional[int] = None):
+        self.gamma = gamma
+        self.refresh_interval = refresh_interval
+        self.limit = limit
+        self.max_backoff = max_backoff
+        self.cpu = cpu  # pin the refresh thread to this core (Linux only)
+
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._updated_at: Optional[float] = None  # time.monotonic() of last refresh
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        # Held for the whole fetch so the background thread and a cold or
+        # stale get_markets() never hit Gamma at the same time
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thr: Optional[threading.Thread] = None
+
+        # Snapshot generation: bumped on every refresh; served_version is the
+        # generation last returned by get_markets()
+        self.version = 0
+        self.served_version = 0
+
+        # get_markets() calls served from cache vs. refetched
+        self.hits = 0
+        self.misses = 0
+
+    def start(self):
+        """Start the background refresh thread (no-op if already running).
+
+        If no snapshot has been loaded yet the first refresh is done here,
+        so the caller's first get_markets() doesn't race the thread's.
+        """
+        if self._thr is not None and self._thr.is_alive():
+            return
+        if self._updated_at is None:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f'Market feed initial refresh failed: {e}', file=sys.stderr)
+        self._stop.clear()
+        self._thr = threading.Thread(target=self._run, name='market-feed', daemon=True)
+        self._thr.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop.set()
+        with self._updated:
+            self._updated.notify_all()
+        if self._thr is not None:
+            self._thr.join(timeout=5)
+            self._thr = None
+
+    def refresh(self) -> List[Dict[str, Any]]:
+        """Fetch open markets from Gamma now and replace the cached snapshot."""
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> List[Dict[str, Any]]:
+        markets = self.gamma.filter_markets(
+            active_only=True,
+            open_only=True,
+            limit=self.limit
+        )
+        snapshot = {}
+        for m in markets:
+            snapshot[m.get('id') or m.get('condition_id') or m.get('slug')] = m
+        with self._lock:
+            self._snapshot = snapshot
+            self._updated_at = time.monotonic()
+            self.version += 1
+            self._updated.notify_all()
+        return markets
+
+    def get_markets(self, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return the cached markets, fetching synchronously if needed.
+
+        Args:
+            max_age: Refetch if the snapshot is older than this many seconds
+                (None = any cached snapshot is acceptable)
+
+        Returns:
+            List of market dicts
+        """
+        with self._lock:
+            if self._is_fresh(max_age):
+                self.hits += 1
+                self.served_version = self.version
+                return list(self._snapshot.values())
+            self.misses += 1
+
+        with self._refresh_lock:
+            # A refresh may have landed while we waited for the lock
+            with self._lock:
+                fresh = self._is_fresh(max_age)
+            if not fresh:
+                try:
+                    self._refresh_locked()
+                except Exception as e:
+                    if self._updated_at is None:
+                        raise
+                    print(f'Market feed refresh failed: {e} (serving stale snapshot)', file=sys.stderr)
+
+        with self._lock:
+            self.served_version = self.version
+            return list(self._snapshot.values())
+
+    def _is_fresh(self, max_age: Optional[float]) -> bool:
+        updated_at = self._updated_at
+        return updated_at is not None and (max_age is None or time.monotonic() - updated_at <= max_age)
+
+    def wait_for_update(self, timeout: float) -> bool:
+        """Block until a snapshot newer than the last one served is available.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a new snapshot is available, False on timeout or stop()
+        """
+        with self._updated:
+            return self._updated.wait_for(
+                lambda: self.version > self.served_version or self._stop.is_set(),
+                timeout
+            ) and not self._stop.is_set()
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Fraction of get_markets() calls served from the cached snapshot."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful refresh (None if never refreshed)."""
+        updated_at = self._updated_at
+        return None if updated_at is None else time.monotonic() - updated_at
+
+    def _run(self):
+        if self.cpu is not None:
+            try:
+                os.sched_setaffinity(threading.get_native_id(), {self.cpu})
+            except (AttributeError, OSError) as e:
+                print(f'Market feed: could not pin to CPU {self.cpu}: {e}', file=sys.stderr)
+
+        backoff = self.refresh_interval
+        while not self._stop.wait(backoff):
+            try:
+                self.refresh()
+                backoff = self.refresh_interval
+            except Exception as e:
+                backoff = min(backoff * 2, self.max_backoff)
+                print(f'Market feed refresh failed: {e} (retrying in {backoff:.0f}s)', file=sys.stderr)
@@ -15,10 +15,12 @@ Features:
 - Trade history logging
 """
 import json
+import logging
+import sys
 import time
 from datetime import datetime
 from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import os
 
 try:
@@ -28,6 +30,8 @@ except ImportError:
     from gamma_client import GammaClient
     from clob_client import ClobClient
 
+logger = logging.getLogger('polymarket.paper_trading')
+
 
 @dataclass
 class SimulatedTrade:
@@ -80,6 +84,8 @@ class PaperTradingEngine:
     Paper trading engine that simulates trade execution.
     """
 
+    VIG = 0.02  # 2% trading costs applied to every position
+
     def __init__(self, starting_balance: float = 10000.0, log_file: str = None):
         """
         Initialize paper trading engine.
@@ -103,6 +109,13 @@ class PaperTradingEngine:
 
         self.log_file = log_file
 
+        # Trade ids: session prefix + per-session counter (no clock read per trade)
+        self._session_prefix = hex(int(time.time()))[2:]
+        self._next_id = 0
+
+        # Closed trades never change again, so serialize each one once
+        self._closed_dicts: List[Dict] = []
+
         print(f"{'='*70}")
         print(f"PAPER TRADING ENGINE INITIALIZED")
         print(f"{'='*70}")
@@ -147,17 +160,28 @@ class PaperTradingEngine:
             SimulatedTrade if successful, None if insufficient balance
         """
         if not self.can_trade(position_size):
-            print(f"  ✗ Insufficient balance for ${position_size:,.2f} trade")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("  ✗ Insufficient balance for $%s trade", format(position_size, ',.2f'))
             return None
 
+        # Slugs and outcome labels repeat across trades; share one copy of each
+        # (only str can be interned; a token's outcome may be null)
+        if type(market_slug) is str:
+            market_slug = sys.intern(market_slug)
+        if type(outcome) is str:
+            outcome = sys.intern(outcome)
+
         # Calculate shares and expected profit
-        shares = position_size / entry_price
-        expected_profit = position_size * (expected_roi / 100)
-        costs = position_size * 0.02  # 2% vig
+        inv_entry = 1.0 / entry_price
+        shares = position_size * inv_entry
+        costs = position_size * self.VIG
+        roi_frac = expected_roi * 0.01
+        expected_profit_net = position_size * roi_frac - costs
 
         # Create simulated trade
+        self._next_id += 1
         trade = SimulatedTrade(
-            trade_id=f"paper_{int(time.time())}_{len(self.session.open_positions) + 1}",
+            trade_id=f"paper_{self._session_prefix}_{self._next_id:x}",
             timestamp=datetime.now(),
             market_id=market_id,
             market_slug=market_slug,
@@ -165,8 +189,8 @@ class PaperTradingEngine:
             entry_price=entry_price,
             position_size=position_size,
             shares=shares,
-            expected_payout=shares * 1.0,  # Assume resolves to $1
-            expected_profit=expected_profit - costs,
+            expected_payout=shares,  # Assume resolves to $1
+            expected_profit=expected_profit_net,
             costs=costs,
             status='open',
             roi_percent=expected_roi,
@@ -178,20 +202,36 @@ class PaperTradingEngine:
         self.session.open_positions.append(trade)
         self.session.total_trades += 1
 
-        print(f"\n{'='*70}")
-        print(f"📝 SIMULATED TRADE ENTRY")
-        print(f"{'='*70}")
-        print(f"Trade ID: {trade.trade_id}")
-        print(f"Market: {trade.market_slug[:60]}")
-        print(f"Outcome: {trade.outcome}")
-        print(f"Entry Price: ${trade.entry_price:.3f}")
-        print(f"Position Size: ${trade.position_size:,.2f}")
-        print(f"Shares: {trade.shares:,.2f}")
-        print(f"Expected Profit: ${trade.expected_profit:,.2f}")
-        print(f"Expected ROI: {trade.roi_percent:.1f}%")
-        print(f"Confidence: {trade.certainty_score * 100:.0f}%")
-        print(f"Reasoning: {trade.reasoning}")
-        print(f"{'='*70}\n")
+        # Only build the trade report arguments when someone will see it
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "\n%s\n"
+                "📝 SIMULATED TRADE ENTRY\n"
+                "%s\n"
+                "Trade ID: %s\n"
+                "Market: %.60s\n"
+                "Outcome: %s\n"
+                "Entry Price: $%.3f\n"
+                "Position Size: $%s\n"
+                "Shares: %s\n"
+                "Expected Profit: $%s\n"
+                "Expected ROI: %.1f%%\n"
+                "Confidence: %.0f%%\n"
+                "Reasoning: %s\n"
+                "%s\n",
+                '='*70, '='*70,
+                trade.trade_id,
+                trade.market_slug,
+                trade.outcome,
+                trade.entry_price,
+                format(trade.position_size, ',.2f'),
+                format(trade.shares, ',.2f'),
+                format(trade.expected_profit, ',.2f'),
+                trade.roi_percent,
+                trade.certainty_score * 100,
+                trade.reasoning,
+                '='*70
+            )
 
         # Save trade log
         self._save_log()
@@ -230,20 +270,35 @@ class PaperTradingEngine:
         # Move to closed positions
         self.session.open_positions.remove(trade)
         self.session.closed_positions.append(trade)
-
-        print(f"\n{'='*70}")
-        print(f"✅ SIMULATED TRADE EXIT")
-        print(f"{'='*70}")
-        print(f"Trade ID: {trade.trade_id}")
-        print(f"Market: {trade.market_slug[:60]}")
-        print(f"Exit Price: ${exit_price:.3f}")
-        print(f"Actual Payout: ${actual_payout:,.2f}")
-        print(f"Actual Profit: ${actual_profit:,.2f}")
-        print(f"ROI: {(actual_profit / trade.position_size) * 100:.1f}%")
-        print(f"Reason: {reason}")
-        print(f"\nUpdated Balance: ${self.session.current_balance:,.2f}")
-        print(f"Session P&L: ${self.session.total_profit:,.2f}")
-        print(f"{'='*70}\n")
+        self._closed_dicts.append(self._trade_to_dict(trade))
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "\n%s\n"
+                "✅ SIMULATED TRADE EXIT\n"
+                "%s\n"
+                "Trade ID: %s\n"
+                "Market: %.60s\n"
+                "Exit Price: $%.3f\n"
+                "Actual Payout: $%s\n"
+                "Actual Profit: $%s\n"
+                "ROI: %.1f%%\n"
+                "Reason: %s\n"
+                "\nUpdated Balance: $%s\n"
+                "Session P&L: $%s\n"
+                "%s\n",
+                '='*70, '='*70,
+                trade.trade_id,
+                trade.market_slug,
+                exit_price,
+                format(actual_payout, ',.2f'),
+                format(actual_profit, ',.2f'),
+                (actual_profit / trade.position_size) * 100,
+                reason,
+                format(self.session.current_balance, ',.2f'),
+                format(self.session.total_profit, ',.2f'),
+                '='*70
+            )
 
         # Save trade log
         self._save_log()
@@ -258,9 +313,7 @@ class PaperTradingEngine:
         if not self.session.open_positions:
             return
 
-        print(f"\n{'='*70}")
-        print(f"AUTO-RESOLVING OPEN POSITIONS")
-        print(f"{'='*70}\n")
+        logger.info("\n%s\nAUTO-RESOLVING OPEN POSITIONS\n%s\n", '='*70, '='*70)
 
         # Simulate resolution for high-certainty trades
         for trade in list(self.session.open_positions):
@@ -349,18 +402,19 @@ class PaperTradingEngine:
                     'total_profit': self.session.total_profit,
                 },
                 'open_positions': [self._trade_to_dict(t) for t in self.session.open_positions],
-                'closed_positions': [self._trade_to_dict(t) for t in self.session.closed_positions]
+                'closed_positions': self._closed_dicts
             }
 
             with open(self.log_file, 'w') as f:
                 json.dump(log_data, f, indent=2)
 
         except Exception as e:
-            print(f"Warning: Could not save trade log: {e}")
+            logger.warning("Could not save trade log: %s", e)
 
     def _trade_to_dict(self, trade: SimulatedTrade) -> Dict:
         """Convert trade to dict for JSON serialization."""
-        d = asdict(trade)
+        # SimulatedTrade is flat, so a shallow copy of __dict__ matches asdict()
+        d = dict(trade.__dict__)
         d['timestamp'] = trade.timestamp.isoformat()
         return d
 
@@ -11,17 +11,73 @@ Usage:
     logger.log_baseline_progress(market_id, snapshots_collected)
     logger.log_cycle_complete(cycle_num, duration_seconds)
 """
-import json
 import logging
 import os
-from datetime import datetime, timedelta
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
-import statistics
+from dataclasses import dataclass, fields
+from itertools import islice
 
+try:
+    from polymarket import fast_json
+except ImportError:
+    import fast_json
 
-@dataclass
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that buffers records instead of flushing after each one.
+
+    The stock FileHandler flushes on every emit, i.e. one write() per log
+    line. Records here accumulate in a 64 KiB buffer and reach disk when
+    the buffer fills, on flush_buffer(), or when the handler is closed.
+    """
+
+    def __init__(self, filename, buffer_size: int = 65536):
+        self.buffer_size = buffer_size
+        super().__init__(filename)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def flush(self):
+        """Called after every record; deliberately a no-op."""
+
+    def flush_buffer(self):
+        """Write buffered records to disk."""
+        self.acquire()
+        try:
+            if self.stream and hasattr(self.stream, 'flush'):
+                self.stream.flush()
+        finally:
+            self.release()
+
+
+def with_to_dict(cls):
+    """
+    Add a generated to_dict() to a dataclass.
+
+    The method is a single dict literal over the class's fields, built once
+    at class-definition time. Unlike dataclasses.asdict it does not walk or
+    deep-copy field values on every call.
+    """
+    items = ", ".join(f"{f.name!r}: self.{f.name}" for f in fields(cls))
+    namespace = {}
+    exec(f"def to_dict(self):\n    return {{{items}}}\n", namespace)
+    to_dict = namespace['to_dict']
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    to_dict.__doc__ = "Return the fields as a flat dict (nested values are not copied)."
+    cls.to_dict = to_dict
+    return cls
+
+
+@with_to_dict
+@dataclass(slots=True)
 class CycleMetrics:
     """Metrics for a single monitoring cycle."""
     cycle_num: int
@@ -56,7 +112,8 @@ class CycleMetrics:
     estimated_days_to_full_baseline: float
 
 
-@dataclass
+@with_to_dict
+@dataclass(slots=True)
 class DailyReport:
     """Daily summary report."""
     date: str
@@ -99,6 +156,25 @@ class ProductionLogger:
     - Progress monitoring
     """
 
+    VOLUME_WINDOW = 20  # Volumes kept per market (matches detector history_window)
+
+    # Baseline completion milestones (percent, alert message), in ascending order
+    BASELINE_MILESTONES = [
+        (25, "🎯 Baseline 25% complete!"),
+        (50, "🎯 Baseline 50% complete - Halfway there!"),
+        (75, "🎯 Baseline 75% complete - Almost ready!"),
+        (100, "🎉 Baseline 100% complete - Ready for live trading!"),
+    ]
+    _MILESTONE_THRESHOLDS = [pct for pct, _ in BASELINE_MILESTONES]
+
+    # Volume anomaly status bands (minimum spike ratio, status), ascending;
+    # ratios below the first band are not alerted
+    ANOMALY_BANDS = [
+        (2.0, "MONITORING"),  # 2x is notable
+        (3.0, "APPROACHING THRESHOLD"),
+    ]
+    _ANOMALY_THRESHOLDS = [ratio for ratio, _ in ANOMALY_BANDS]
+
     def __init__(self, log_dir: str = None):
         """
         Initialize production logger.
@@ -117,9 +193,16 @@ class ProductionLogger:
 
         # Metrics tracking
         self.cycle_metrics: List[CycleMetrics] = []
-        self.daily_markets_tracked = set()
+        self.daily_markets_tracked = set()  # Unique market ids seen today
+        self._tracked_date = date.today()
         self.baseline_snapshots = {}  # market_id -> snapshot_count
-        self.volume_history = {}  # market_id -> [volumes...]
+        # Incrementally maintained: markets at >= N snapshots, and total snapshots
+        self._threshold_counts = {5: 0, 10: 0, 20: 0}
+        self._snapshot_total = 0
+        self._next_milestone = 0  # Index of the next BASELINE_MILESTONES entry to fire
+        # market_id -> last VOLUME_WINDOW volumes, plus their running sum
+        self.volume_history = defaultdict(lambda: deque(maxlen=self.VOLUME_WINDOW))
+        self._volume_sums: Dict[str, float] = defaultdict(float)
 
         # Session tracking
         self.session_start = datetime.now()
@@ -134,39 +217,48 @@ class ProductionLogger:
     def _setup_loggers(self):
         """Setup different log files for different purposes."""
 
+        day = datetime.now().strftime("%Y%m%d")
+
         # 1. Main activity log (human-readable)
         self.activity_logger = self._create_logger(
             'activity',
-            self.log_dir / f'activity_{datetime.now().strftime("%Y%m%d")}.log',
+            self.log_dir / f'activity_{day}.log',
             '%(asctime)s [%(levelname)s] %(message)s'
         )
 
-        # 2. Metrics log (JSON structured)
-        self.metrics_logger = self._create_logger(
-            'metrics',
-            self.log_dir / f'metrics_{datetime.now().strftime("%Y%m%d")}.jsonl',
-            '%(message)s'
-        )
+        # 2. Metrics log (JSON structured, one record per line). Records are
+        # encoded straight to bytes, collected in a per-cycle buffer and
+        # appended to this fd with one write per cycle
+        metrics_file = self.log_dir / f'metrics_{day}.jsonl'
+        self._metrics_fd = os.open(metrics_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._metrics_buf = bytearray()
 
-        # 3. Alerts log (important events)
+        # 3. Alerts log (important events, rare - flushed per record)
         self.alerts_logger = self._create_logger(
             'alerts',
             self.log_dir / 'alerts.log',
-            '%(asctime)s [ALERT] %(message)s'
+            '%(asctime)s [ALERT] %(message)s',
+            buffered=False
         )
 
         # 4. Daily reports
         self.reports_dir = self.log_dir / 'daily_reports'
         self.reports_dir.mkdir(exist_ok=True)
 
-    def _create_logger(self, name: str, log_file: Path, format_str: str) -> logging.Logger:
+    def _create_logger(self, name: str, log_file: Path, format_str: str,
+                       buffered: bool = True) -> logging.Logger:
         """Create a logger with file and console handlers."""
         logger = logging.getLogger(f'polymarket.{name}')
         logger.setLevel(logging.INFO)
         logger.handlers.clear()
+        # Handlers below are complete; don't also pass records to root
+        logger.propagate = False
 
-        # File handler
-        file_handler = logging.FileHandler(log_file)
+        # File handler (buffered handlers are flushed once per cycle)
+        if buffered:
+            file_handler = BufferedFileHandler(log_file)
+        else:
+            file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(logging.Formatter(format_str))
         logger.addHandler(file_handler)
 
@@ -178,74 +270,125 @@ class ProductionLogger:
 
         return logger
 
-    def info(self, message: str, data: Dict = None):
-        """Log informational message."""
+    def flush(self):
+        """Write buffered activity and metrics records to disk."""
+        for handler in self.activity_logger.handlers:
+            if isinstance(handler, BufferedFileHandler):
+                handler.flush_buffer()
+        self._flush_metrics()
+
+    def _write_metrics(self, record: Dict):
+        """Queue one JSON record for the metrics log."""
+        self._metrics_buf += fast_json.dumps(record)
+        self._metrics_buf += b"\n"
+
+    def _flush_metrics(self):
+        """Append all queued metrics records with a single write."""
+        if self._metrics_buf and self._metrics_fd is not None:
+            os.write(self._metrics_fd, self._metrics_buf)
+            self._metrics_buf.clear()
+
+    def close(self):
+        """Flush buffered records and release the metrics file descriptor."""
+        self.flush()
+        if self._metrics_fd is not None:
+            os.close(self._metrics_fd)
+            self._metrics_fd = None
+
+    def info(self, message: str, data: Dict = None, _ts: str = None):
+        """Log informational message (_ts: caller's timestamp, skips a clock read)."""
         self.activity_logger.info(message)
         if data:
-            self.metrics_logger.info(json.dumps({
-                "timestamp": datetime.now().isoformat(),
+            self._write_metrics({
+                "timestamp": _ts or datetime.now().isoformat(),
                 "level": "INFO",
                 "message": message,
                 "data": data
-            }))
+            })
 
-    def alert(self, message: str, data: Dict = None):
+    def alert(self, message: str, data: Dict = None, _ts: str = None):
         """Log alert (important event)."""
         self.activity_logger.warning(f"⚠️  {message}")
         self.alerts_logger.warning(message)
         if data:
-            self.metrics_logger.info(json.dumps({
-                "timestamp": datetime.now().isoformat(),
+            self._write_metrics({
+                "timestamp": _ts or datetime.now().isoformat(),
                 "level": "ALERT",
                 "message": message,
                 "data": data
-            }))
+            })
+            # Alerts are latency-sensitive: don't hold them until cycle end
+            self._flush_metrics()
 
-    def error(self, message: str, error: Exception = None):
+    def error(self, message: str, error: Exception = None, _ts: str = None):
         """Log error."""
         self.activity_logger.error(message)
         self.alerts_logger.error(message)
         self.api_errors += 1
 
         error_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _ts or datetime.now().isoformat(),
             "level": "ERROR",
             "message": message,
             "error": str(error) if error else None
         }
-        self.metrics_logger.info(json.dumps(error_data))
+        self._write_metrics(error_data)
+        self._flush_metrics()
 
     def log_cycle_start(self, cycle_num: int):
         """Log start of monitoring cycle."""
+        now = datetime.now()
         self.cycles_run = cycle_num
-        self.cycle_start_time = datetime.now()
+        self.cycle_start_time = now
+        self._cycle_t0 = time.monotonic()
 
         self.info(f"Starting cycle #{cycle_num}", {
             "cycle": cycle_num,
-            "session_runtime_hours": self._get_session_runtime_hours()
-        })
+            "session_runtime_hours": self._get_session_runtime_hours(now)
+        }, _ts=now.isoformat())
 
     def log_market_scan(self, markets: List[Dict]):
         """Log market scan results with detailed volume breakdown."""
 
-        # Calculate volume metrics
-        volumes = [m.get('volume', 0) for m in markets if m.get('volume')]
-
-        high_volume = [m for m in markets if m.get('volume', 0) > 100000]
-        target_range = [m for m in markets if 10000 <= m.get('volume', 0) <= 100000]
-        low_volume = [m for m in markets if 0 < m.get('volume', 0) < 10000]
-
+        # Extract volumes in the only Python-level loop; everything below
+        # runs in C builtins (sum, sort, bisect) on the flat list
+        volumes = []
+        max_volume = 0
+        max_market = None
+
+        for m in markets:
+            volume = m.get('volume') or 0
+            if volume > 0:
+                volumes.append(volume)
+                if volume > max_volume:
+                    max_volume = volume
+                    max_market = m
+
+        volumes.sort()
         total_volume = sum(volumes)
-        avg_volume = statistics.mean(volumes) if volumes else 0
-        median_volume = statistics.median(volumes) if volumes else 0
-        max_volume = max(volumes) if volumes else 0
+        low_volume = bisect_left(volumes, 10000)  # <$10K
+        high_volume = len(volumes) - bisect_right(volumes, 100000)  # >$100K
+        target_range = len(volumes) - low_volume - high_volume  # $10K-$100K
+
+        count = len(volumes)
+        avg_volume = total_volume / count if count else 0
+        # volumes is sorted, so the median is read off directly
+        if count:
+            mid = count // 2
+            median_volume = volumes[mid] if count % 2 else (volumes[mid - 1] + volumes[mid]) / 2
+        else:
+            median_volume = 0
         max_volume_market = ""
 
-        if max_volume > 0:
-            max_market = max(markets, key=lambda m: m.get('volume', 0))
+        if max_market is not None:
             max_volume_market = max_market.get('slug', max_market.get('question', 'unknown'))[:50]
 
-        # Track markets
+        # Track markets (the set only covers today, so reset on day rollover)
+        today = date.today()
+        if today != self._tracked_date:
+            self.daily_markets_tracked.clear()
+            self._tracked_date = today
+
         for market in markets:
             market_id = market.get('id', market.get('condition_id'))
             if market_id:
@@ -253,9 +396,9 @@ class ProductionLogger:
 
         data = {
             "total_markets": len(markets),
-            "high_volume_count": len(high_volume),
-            "target_range_count": len(target_range),
-            "low_volume_count": len(low_volume),
+            "high_volume_count": high_volume,
+            "target_range_count": target_range,
+            "low_volume_count": low_volume,
             "total_volume_24h": f"${total_volume:,.0f}",
             "avg_volume": f"${avg_volume:,.0f}",
             "median_volume": f"${median_volume:,.0f}",
@@ -267,9 +410,9 @@ class ProductionLogger:
 
         return {
             "total_markets": len(markets),
-            "high_volume": len(high_volume),
-            "target_range": len(target_range),
-            "low_volume": len(low_volume),
+            "high_volume": high_volume,
+            "target_range": target_range,
+            "low_volume": low_volume,
             "total_volume": total_volume,
             "avg_volume": avg_volume,
             "median_volume": median_volume,
@@ -280,27 +423,35 @@ class ProductionLogger:
     def log_baseline_progress(self, volume_history_dict: Dict):
         """Log baseline collection progress."""
 
-        # Analyze snapshot counts
-        snapshot_counts = {}
+        # Sync snapshot counts (counters only move for markets that changed)
+        known = self.baseline_snapshots
         for market_id, history in volume_history_dict.items():
-            count = len(history.snapshots) if hasattr(history, 'snapshots') else 0
-            snapshot_counts[market_id] = count
-            self.baseline_snapshots[market_id] = count
+            count = len(history)
+            if known.get(market_id) != count:
+                self.on_snapshot_added(market_id, count)
 
-        total_markets = len(snapshot_counts)
+        # Drop markets the detector no longer tracks
+        if len(known) > len(volume_history_dict):
+            for market_id in [m for m in known if m not in volume_history_dict]:
+                self.on_snapshot_added(market_id, 0)
+                del known[market_id]
+
+        total_markets = len(known)
         if total_markets == 0:
             return
 
         # Calculate progress metrics
-        markets_5plus = sum(1 for c in snapshot_counts.values() if c >= 5)
-        markets_10plus = sum(1 for c in snapshot_counts.values() if c >= 10)
-        markets_20 = sum(1 for c in snapshot_counts.values() if c >= 20)
+        markets_5plus = self._threshold_counts[5]
+        markets_10plus = self._threshold_counts[10]
+        markets_20 = self._threshold_counts[20]
 
-        avg_snapshots = statistics.mean(snapshot_counts.values())
+        avg_snapshots = self._snapshot_total / total_markets
         baseline_completion = (avg_snapshots / 20) * 100
 
         # Estimate days to completion
-        session_hours = self._get_session_runtime_hours()
+        now = datetime.now()
+        ts = now.isoformat()
+        session_hours = self._get_session_runtime_hours(now)
         if session_hours > 0 and avg_snapshots > 0:
             snapshots_per_hour = avg_snapshots / session_hours
             remaining_snapshots = 20 - avg_snapshots
@@ -319,17 +470,13 @@ class ProductionLogger:
             "estimated_days_to_completion": f"{days_to_complete:.1f} days"
         }
 
-        self.info("Baseline collection progress", progress_data)
+        self.info("Baseline collection progress", progress_data, _ts=ts)
 
-        # Alert milestones
-        if baseline_completion >= 25 and baseline_completion < 26:
-            self.alert("🎯 Baseline 25% complete!", progress_data)
-        elif baseline_completion >= 50 and baseline_completion < 51:
-            self.alert("🎯 Baseline 50% complete - Halfway there!", progress_data)
-        elif baseline_completion >= 75 and baseline_completion < 76:
-            self.alert("🎯 Baseline 75% complete - Almost ready!", progress_data)
-        elif baseline_completion >= 100:
-            self.alert("🎉 Baseline 100% complete - Ready for live trading!", progress_data)
+        # Alert milestones, each once, however far completion jumped this cycle
+        reached = bisect_right(self._MILESTONE_THRESHOLDS, baseline_completion)
+        for _, message in self.BASELINE_MILESTONES[self._next_milestone:reached]:
+            self.alert(message, progress_data, _ts=ts)
+        self._next_milestone = max(self._next_milestone, reached)
 
         return {
             "markets_5plus": markets_5plus,
@@ -339,34 +486,57 @@ class ProductionLogger:
             "days_to_complete": days_to_complete
         }
 
+    def on_snapshot_added(self, market_id: str, new_count: int):
+        """
+        Record a market's new snapshot count.
+
+        Updates the per-threshold market counts and the snapshot total so
+        log_baseline_progress can read them in O(1).
+        """
+        old_count = self.baseline_snapshots.get(market_id, 0)
+        self.baseline_snapshots[market_id] = new_count
+        self._snapshot_total += new_count - old_count
+
+        for threshold in self._threshold_counts:
+            if old_count < threshold <= new_count:
+                self._threshold_counts[threshold] += 1
+            elif new_count < threshold <= old_count:
+                self._threshold_counts[threshold] -= 1
+
     def log_volume_anomaly(self, market_id: str, market_slug: str,
                           current_volume: float, avg_volume: float, spike_ratio: float):
         """Log detected volume anomaly (even if below spike threshold)."""
 
-        # Track for daily report
-        if market_id not in self.volume_history:
-            self.volume_history[market_id] = []
-        self.volume_history[market_id].append(current_volume)
+        # Track for daily report (bounded window with a running sum)
+        volumes = self.volume_history[market_id]
+        if len(volumes) == volumes.maxlen:
+            self._volume_sums[market_id] -= volumes[0]
+        self._volume_sums[market_id] += current_volume
+        volumes.append(current_volume)
 
         # Alert on significant changes (even if not tradeable yet)
-        if spike_ratio >= 2.0:  # 2x is notable
+        band = bisect_right(self._ANOMALY_THRESHOLDS, spike_ratio)
+        if band:
             self.alert(f"Volume increase detected: {market_slug}", {
                 "market_id": market_id,
                 "current_volume": f"${current_volume:,.0f}",
                 "avg_volume": f"${avg_volume:,.0f}",
                 "spike_ratio": f"{spike_ratio:.1f}x",
-                "status": "MONITORING" if spike_ratio < 3.0 else "APPROACHING THRESHOLD"
+                "status": self.ANOMALY_BANDS[band - 1][1]
             })
 
     def log_cycle_complete(self, cycle_num: int, scan_results: Dict,
                           baseline_progress: Dict, api_time_ms: float):
         """Log cycle completion with comprehensive metrics."""
 
-        duration = (datetime.now() - self.cycle_start_time).total_seconds()
+        # Duration from the monotonic clock (immune to NTP/wall-clock steps);
+        # one wall-clock read serves every timestamp below
+        duration = time.monotonic() - self._cycle_t0
+        ts = datetime.now().isoformat()
 
         metrics = CycleMetrics(
             cycle_num=cycle_num,
-            timestamp=datetime.now().isoformat(),
+            timestamp=ts,
             duration_seconds=duration,
             total_markets_scanned=scan_results['total_markets'],
             high_volume_markets=scan_results['high_volume'],
@@ -389,19 +559,30 @@ class ProductionLogger:
 
         self.cycle_metrics.append(metrics)
 
-        # Log structured metrics
-        self.metrics_logger.info(json.dumps(asdict(metrics)))
+        message = f"Cycle #{cycle_num} complete"
+        self.activity_logger.info(message)
 
-        self.info(f"Cycle #{cycle_num} complete", {
-            "duration": f"{duration:.1f}s",
-            "baseline_progress": f"{metrics.baseline_completion_pct:.1f}%",
-            "markets_ready": metrics.markets_ready_for_detection
-        })
+        summary = {
+            "timestamp": ts,
+            "level": "INFO",
+            "message": message,
+            "data": {
+                "duration": f"{duration:.1f}s",
+                "baseline_progress": f"{metrics.baseline_completion_pct:.1f}%",
+                "markets_ready": metrics.markets_ready_for_detection
+            }
+        }
+        self._write_metrics(metrics.to_dict())
+        self._write_metrics(summary)
+
+        # Cycle boundary: write everything buffered this cycle to disk
+        self.flush()
 
     def generate_daily_report(self) -> DailyReport:
         """Generate comprehensive daily summary report."""
 
-        today = datetime.now().date()
+        now = datetime.now()
+        today = now.date()
 
         # Filter today's metrics
         today_metrics = [
@@ -414,7 +595,7 @@ class ProductionLogger:
 
         # Calculate aggregates
         total_cycles = len(today_metrics)
-        avg_cycle_duration = statistics.mean([m.duration_seconds for m in today_metrics])
+        avg_cycle_duration = sum(m.duration_seconds for m in today_metrics) / total_cycles
 
         # Baseline progress
         latest_metrics = today_metrics[-1]
@@ -424,12 +605,15 @@ class ProductionLogger:
 
         # Volume trends
         volumes = [m.total_volume_24h for m in today_metrics]
-        avg_volume = statistics.mean(volumes)
+        total_volume = sum(volumes)
+        avg_volume = total_volume / len(volumes)
 
-        # Determine trend
+        # Determine trend (second half's sum is the remainder of the total)
         if len(volumes) >= 3:
-            first_half = statistics.mean(volumes[:len(volumes)//2])
-            second_half = statistics.mean(volumes[len(volumes)//2:])
+            half = len(volumes) // 2
+            first_sum = sum(islice(volumes, half))
+            first_half = first_sum / half
+            second_half = (total_volume - first_sum) / (len(volumes) - half)
             if second_half > first_half * 1.1:
                 trend = "increasing"
             elif second_half < first_half * 0.9:
@@ -442,31 +626,40 @@ class ProductionLogger:
         # Top markets (from latest cycle)
         top_markets = []  # Would need to track individual market volumes
 
-        # Anomalies
-        unusual_changes = []
-        potential_spikes = []
+        # Anomalies: the report keeps the first 10 of each kind, so classify
+        # with plain tuples, stop once both are full, and only format those
+        unusual = []
+        potential = []
 
+        volume_sums = self._volume_sums
         for market_id, volumes in self.volume_history.items():
             if len(volumes) >= 2:
                 recent = volumes[-1]
-                avg = statistics.mean(volumes[:-1])
+                avg = (volume_sums[market_id] - recent) / (len(volumes) - 1)
                 ratio = recent / avg if avg > 0 else 1.0
 
                 if ratio >= 2.5:  # Approaching threshold
-                    potential_spikes.append({
-                        "market_id": market_id,
-                        "ratio": f"{ratio:.1f}x",
-                        "current_volume": f"${recent:,.0f}"
-                    })
+                    if len(potential) < 10:
+                        potential.append((market_id, ratio, recent))
                 elif ratio >= 1.5:  # Notable increase
-                    unusual_changes.append({
-                        "market_id": market_id,
-                        "ratio": f"{ratio:.1f}x",
-                        "current_volume": f"${recent:,.0f}"
-                    })
+                    if len(unusual) < 10:
+                        unusual.append((market_id, ratio, recent))
+                else:
+                    continue
+                if len(potential) == 10 and len(unusual) == 10:
+                    break
+
+        potential_spikes = [
+            {"market_id": market_id, "ratio": f"{ratio:.1f}x", "current_volume": f"${recent:,.0f}"}
+            for market_id, ratio, recent in potential
+        ]
+        unusual_changes = [
+            {"market_id": market_id, "ratio": f"{ratio:.1f}x", "current_volume": f"${recent:,.0f}"}
+            for market_id, ratio, recent in unusual
+        ]
 
         # Health metrics
-        session_runtime = self._get_session_runtime_hours()
+        session_runtime = self._get_session_runtime_hours(now)
         expected_cycles = int(session_runtime * 2)  # 2 cycles per hour (30s interval)
         uptime_pct = (total_cycles / expected_cycles * 100) if expected_cycles > 0 else 100
 
@@ -482,8 +675,8 @@ class ProductionLogger:
             avg_total_volume_24h=avg_volume,
             volume_trend=trend,
             top_volume_markets=top_markets,
-            unusual_volume_changes=unusual_changes[:10],
-            potential_early_spikes=potential_spikes[:10],
+            unusual_volume_changes=unusual_changes,
+            potential_early_spikes=potential_spikes,
             uptime_pct=uptime_pct,
             avg_cycle_duration=avg_cycle_duration,
             api_error_rate=(self.api_errors / total_cycles * 100) if total_cycles > 0 else 0
@@ -491,16 +684,20 @@ class ProductionLogger:
 
         # Save report
         report_file = self.reports_dir / f'report_{today.isoformat()}.json'
-        with open(report_file, 'w') as f:
-            json.dump(asdict(report), f, indent=2)
+        payload = fast_json.dumps(report.to_dict(), indent=True)
+        fd = os.open(report_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
 
         self.alert(f"📊 Daily report generated: {report_file}")
 
         return report
 
-    def _get_session_runtime_hours(self) -> float:
-        """Get total session runtime in hours."""
-        return (datetime.now() - self.session_start).total_seconds() / 3600
+    def _get_session_runtime_hours(self, now: datetime = None) -> float:
+        """Get total session runtime in hours (as of `now`, default: current time)."""
+        return ((now or datetime.now()) - self.session_start).total_seconds() / 3600
 
     def print_daily_summary(self, report: DailyReport):
         """Print human-readable daily summary to console."""
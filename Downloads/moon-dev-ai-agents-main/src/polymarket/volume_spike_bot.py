@@ -9,9 +9,14 @@ Strategy: Detect and trade on volume spikes that signal imminent resolution
 
 This is latency arbitrage - beating the crowd to the trade.
 """
+import heapq
+import logging
+import queue
+import sys
+import threading
 import time
 import os
-from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import List, Dict
 from dotenv import load_dotenv
 
@@ -20,16 +25,20 @@ load_dotenv()
 try:
     from polymarket.gamma_client import GammaClient
     from polymarket.clob_client import ClobClient
+    from polymarket.market_feed import MarketFeed
     from polymarket.volume_spike_detector import VolumeSpikeDetector, VolumeSpike
     from polymarket.paper_trading import PaperTradingEngine
     from polymarket.authenticated_trader import AuthenticatedTrader
 except ImportError:
     from gamma_client import GammaClient
     from clob_client import ClobClient
+    from market_feed import MarketFeed
     from volume_spike_detector import VolumeSpikeDetector, VolumeSpike
     from paper_trading import PaperTradingEngine
     from authenticated_trader import AuthenticatedTrader
 
+logger = logging.getLogger('polymarket.volume_spike_bot')
+
 
 class VolumeSpikeBot:
     """
@@ -44,7 +53,9 @@ class VolumeSpikeBot:
                  min_spike_ratio: float = 3.0,
                  min_volume_usd: float = 50000,
                  max_hours_to_deadline: float = 72,
-                 check_interval: int = 30):
+                 check_interval: int = 30,
+                 full_scan_interval: int = 60,
+                 min_change_score: float = 10.0):
         """
         Initialize volume spike bot.
 
@@ -54,9 +65,15 @@ class VolumeSpikeBot:
             min_volume_usd: Minimum absolute volume
             max_hours_to_deadline: Only trade markets within N hours of deadline
             check_interval: Seconds between market scans
+            full_scan_interval: Seconds between scans that test every market;
+                scans in between only test markets whose volume moved
+            min_change_score: Minimum change-point score for a spike to trade
+                (see VolumeHistory.get_change_point_score; 0 = off)
         """
         self.paper_trading = paper_trading
         self.check_interval = check_interval
+        self.full_scan_interval = full_scan_interval
+        self._last_full_scan = None  # time.monotonic() of last full scan
 
         print(f"\n{'='*70}")
         print(f"VOLUME SPIKE BOT INITIALIZING")
@@ -66,12 +83,35 @@ class VolumeSpikeBot:
         self.gamma = GammaClient()
         self.clob = ClobClient()
 
+        # Live mode: give the trading thread and the feed thread a core each
+        # (Linux only; needs at least one core left over for everything else)
+        self.trading_cpu = feed_cpu = None
+        self._worker_cpus = None  # cores left for worker threads
+        self._worker_nice = None  # niceness before the trading thread's boost
+        if not paper_trading and hasattr(os, 'sched_getaffinity'):
+            cores = sorted(os.sched_getaffinity(0))
+            if len(cores) >= 3:
+                self.trading_cpu, feed_cpu = cores[-1], cores[-2]
+                self._worker_cpus = set(cores[:-2])
+
+        # Market snapshots are refreshed in the background so a cycle reads
+        # a warm cache instead of waiting on the Gamma request
+        self.feed = MarketFeed(self.gamma, refresh_interval=check_interval, limit=10000,
+                               cpu=feed_cpu)
+
         self.detector = VolumeSpikeDetector(
             min_spike_ratio=min_spike_ratio,
             min_volume_usd=min_volume_usd,
             max_hours_to_deadline=max_hours_to_deadline,
-            history_window=20
+            history_window=20,
+            min_change_score=min_change_score
         )
+        self.detector.save_thread_initializer = self._unpin_worker_thread
+
+        # Markets resolving later than the detector's tracking horizon are
+        # skipped before it sees them; the lead over max_hours_to_deadline
+        # lets a baseline build up before a market becomes tradeable
+        self.deadline_horizon_hours = self.detector.tracking_horizon_hours
 
         # Trading engine
         if paper_trading:
@@ -93,39 +133,65 @@ class VolumeSpikeBot:
         print(f"Min Spike Ratio: {min_spike_ratio}x")
         print(f"Min Volume: ${min_volume_usd:,.0f}")
         print(f"Max Hours to Deadline: {max_hours_to_deadline}h")
+        print(f"Min Change Score: {min_change_score or 'off'}")
         print(f"Check Interval: {check_interval}s")
+        print(f"Full Scan Interval: {full_scan_interval}s")
         print(f"{'='*70}\n")
 
-    def fetch_markets(self) -> List[Dict]:
+    def fetch_markets(self, now_ts: float = None) -> List[Dict]:
         """
         Fetch active markets with volume data.
 
+        Args:
+            now_ts: Cycle timestamp, epoch seconds (default: current time)
+
         Returns:
-            List of markets ready for scanning
+            List of markets ready for scanning (with volume data and within
+            the deadline horizon)
         """
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Fetching markets...")
-
-        # Get ALL open markets from Gamma (for high-frequency trading)
-        markets = self.gamma.filter_markets(
-            active_only=True,
-            open_only=True,
-            limit=10000  # Get all markets for HFT
-        )
-
-        # Filter for markets with volume data
-        markets_with_volume = [
-            m for m in markets
-            if m.get('volume') is not None and m.get('volume') > 0
-        ]
-
-        # Categorize by volume tier for HFT optimization
-        high_volume = [m for m in markets_with_volume if m.get('volume', 0) > 100000]
-        target_range = [m for m in markets_with_volume if 10000 <= m.get('volume', 0) <= 100000]
-
-        print(f"  ✓ {len(markets_with_volume)} markets with volume data found")
-        print(f"    • High volume (>$100K): {len(high_volume)} markets")
-        print(f"    • Target range ($10K-$100K): {len(target_range)} markets")
-        print(f"    • Total HFT targets: {len(high_volume) + len(target_range)} markets")
+        if now_ts is None:
+            now_ts = time.time()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[{time.strftime('%H:%M:%S', time.localtime(now_ts))}] Fetching markets...")
+
+        # Get ALL open markets (for high-frequency trading) from the feed's
+        # cached snapshot; it is refetched from Gamma directly on cold start
+        # or if older than one check interval
+        markets = self.feed.get_markets(max_age=self.check_interval)
+
+        # Filter for markets with volume data that resolve within the deadline
+        # horizon, and categorize by volume tier for HFT optimization, reading
+        # each market's fields once
+        markets_with_volume = []
+        high_volume = target_range = beyond_horizon = 0
+        horizon = self.deadline_horizon_hours
+        horizon_ts = now_ts + horizon * 3600
+        parse_deadline = self.detector.parse_deadline  # cached per end_time string
+        for m in markets:
+            volume = m.get('volume')
+            if volume is None or volume <= 0:
+                continue
+
+            # Markets with a missing/unparseable end time are kept
+            end_ts = parse_deadline(m.get('end_time'))
+            if end_ts is not None and end_ts > horizon_ts:
+                beyond_horizon += 1
+                continue
+
+            markets_with_volume.append(m)
+            if volume > 100000:
+                high_volume += 1
+            elif volume >= 10000:
+                target_range += 1
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"  ✓ {len(markets_with_volume)} of {len(markets)} markets with volume data "
+                f"within {horizon:.1f}h of deadline ({beyond_horizon} resolving later skipped)\n"
+                f"    • High volume (>$100K): {high_volume} markets\n"
+                f"    • Target range ($10K-$100K): {target_range} markets\n"
+                f"    • Total HFT targets: {high_volume + target_range} markets"
+            )
 
         return markets_with_volume
 
@@ -139,11 +205,21 @@ class VolumeSpikeBot:
         Returns:
             List of detected volume spikes
         """
-        print(f"  Scanning {len(markets)} markets for volume spikes...")
+        logger.info("  Scanning %d markets for volume spikes...", len(markets))
 
-        spikes = self.detector.detect_spikes(markets)
+        # React to volume deltas: most cycles only test markets whose volume
+        # moved, with a periodic full sweep for spikes that emerge as old
+        # readings roll out of the window
+        now_mono = time.monotonic()
+        full_scan = (self._last_full_scan is None
+                     or now_mono - self._last_full_scan >= self.full_scan_interval)
+        if full_scan:
+            self._last_full_scan = now_mono
 
-        print(f"  ✓ {len(spikes)} volume spikes detected\n")
+        spikes = self.detector.detect_spikes(markets, full_scan=full_scan)
+
+        logger.info("  ✓ %d volume spikes detected (%s)\n", len(spikes),
+                    'full scan' if full_scan else 'moved markets only')
 
         return spikes
 
@@ -160,79 +236,91 @@ class VolumeSpikeBot:
         if not spikes:
             return 0
 
-        executed = 0
-
-        # Take top 3 strongest signals
-        top_spikes = spikes[:3]
-
-        for spike in top_spikes:
-            print(f"\n{'='*70}")
-            print(f"EXECUTING TRADE - VOLUME SPIKE DETECTED")
-            print(f"{'='*70}")
-            print(f"Market: {spike.market_slug[:65]}")
-            print(f"Outcome: {spike.outcome}")
-            print(f"\nVolume Spike:")
-            print(f"  Current: ${spike.current_volume_24h:,.0f}")
-            print(f"  Average: ${spike.avg_volume_24h:,.0f}")
-            print(f"  Spike Ratio: {spike.volume_spike_ratio:.1f}x")
-            print(f"\nPrice Action:")
-            print(f"  Current Price: ${spike.current_price:.3f}")
-            print(f"  1h Change: {spike.price_change_1h:+.1f}%")
-            print(f"\nTiming:")
-            print(f"  Hours to Deadline: {spike.hours_to_deadline:.1f}h")
-            print(f"  Deadline Proximity: {spike.deadline_proximity_score:.0f}/100")
-            print(f"\nSignal:")
-            print(f"  Strength: {spike.signal_strength:.0f}/100")
-            print(f"  Confidence: {spike.confidence:.0f}/100")
-            print(f"\nTrade Sizing:")
-            print(f"  Recommended Position: ${spike.recommended_position_usd:,.0f}")
-            print(f"  Max Loss: ${spike.max_loss_usd:,.0f}")
-            print(f"  Expected ROI: {spike.expected_roi_percent:.1f}%")
-            print(f"\nReasoning: {spike.reasoning}")
-            print(f"{'='*70}\n")
+        # Take top 3 strongest signals (detector output is unordered)
+        top_spikes = heapq.nlargest(3, spikes, key=lambda s: s.signal_strength)
 
-            try:
-                if self.paper_trading:
-                    # Execute paper trade directly (no ArbitrageOpportunity needed)
-                    trade = self.trader.execute_trade(
-                        market_id=spike.market_id,
-                        market_slug=spike.market_slug,
-                        outcome=spike.outcome,
-                        entry_price=spike.current_price,
-                        position_size=spike.recommended_position_usd,
-                        expected_roi=spike.expected_roi_percent,
-                        confidence=spike.confidence,
-                        reasoning=spike.reasoning
-                    )
-                    if trade:
-                        executed += 1
-                else:
-                    # Live trading
-                    # TODO: Implement authenticated trade execution
-                    print("⚠️  Live trading not yet implemented for volume spikes")
-                    print("Would execute trade here...")
+        return sum(self._submit_trade(spike) for spike in top_spikes)
+
+    def _submit_trade(self, spike: VolumeSpike) -> bool:
+        """
+        Report and execute a single spike trade.
+
+        Errors are logged here so one failed trade doesn't stop the others.
+
+        Returns:
+            True if the trade was executed
+        """
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"\n{'='*70}\n"
+                f"EXECUTING TRADE - VOLUME SPIKE DETECTED\n"
+                f"{'='*70}\n"
+                f"Market: {spike.market_slug[:65]}\n"
+                f"Outcome: {spike.outcome}\n"
+                f"\nVolume Spike:\n"
+                f"  Current: ${spike.current_volume_24h:,.0f}\n"
+                f"  Average: ${spike.avg_volume_24h:,.0f}\n"
+                f"  Spike Ratio: {spike.volume_spike_ratio:.1f}x\n"
+                f"\nPrice Action:\n"
+                f"  Current Price: ${spike.current_price:.3f}\n"
+                f"  1h Change: {spike.price_change_1h:+.1f}%\n"
+                f"\nTiming:\n"
+                f"  Hours to Deadline: {spike.hours_to_deadline:.1f}h\n"
+                f"  Deadline Proximity: {spike.deadline_proximity_score:.0f}/100\n"
+                f"\nSignal:\n"
+                f"  Strength: {spike.signal_strength:.0f}/100\n"
+                f"  Confidence: {spike.confidence:.0f}/100\n"
+                f"\nTrade Sizing:\n"
+                f"  Recommended Position: ${spike.recommended_position_usd:,.0f}\n"
+                f"  Max Loss: ${spike.max_loss_usd:,.0f}\n"
+                f"  Expected ROI: {spike.expected_roi_percent:.1f}%\n"
+                f"\nReasoning: {spike.reasoning}\n"
+                f"{'='*70}\n"
+            )
 
-            except Exception as e:
-                print(f"✗ Trade execution failed: {e}")
-                import traceback
-                traceback.print_exc()
+        try:
+            if self.paper_trading:
+                # Execute paper trade directly (no ArbitrageOpportunity needed)
+                trade = self.trader.execute_trade(
+                    market_id=spike.market_id,
+                    market_slug=spike.market_slug,
+                    outcome=spike.outcome,
+                    entry_price=spike.current_price,
+                    position_size=spike.recommended_position_usd,
+                    expected_roi=spike.expected_roi_percent,
+                    confidence=spike.confidence,
+                    reasoning=spike.reasoning
+                )
+                return bool(trade)
+
+            # Live trading
+            # TODO: Implement authenticated trade execution
+            logger.warning("⚠️  Live trading not yet implemented for volume spikes\n"
+                           "Would execute trade here...")
+            return False
 
-        return executed
+        except Exception as e:
+            logger.exception(f"✗ Trade execution failed: {e}")
+            return False
 
     def run_cycle(self):
         """Run a single monitoring and trading cycle."""
         self.check_count += 1
+        now_ts = time.time()
 
-        print(f"\n{'='*70}")
-        print(f"CYCLE #{self.check_count} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"{'='*70}\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"\n{'='*70}\n"
+                f"CYCLE #{self.check_count} - {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now_ts))}\n"
+                f"{'='*70}\n"
+            )
 
         try:
             # 1. Fetch markets with volume data
-            markets = self.fetch_markets()
+            markets = self.fetch_markets(now_ts)
 
             if not markets:
-                print("No markets available\n")
+                logger.info("No markets available\n")
                 return
 
             # 2. Scan for volume spikes
@@ -240,19 +328,56 @@ class VolumeSpikeBot:
             self.spikes_detected += len(spikes)
 
             if not spikes:
-                print("No volume spikes detected this cycle\n")
+                logger.info("No volume spikes detected this cycle\n")
                 return
 
             # 3. Execute trades for top signals
             executed = self.execute_trades(spikes)
             self.trades_executed += executed
 
-            print(f"\n✓ Executed {executed} trades this cycle\n")
+            logger.info("\n✓ Executed %d trades this cycle\n", executed)
 
         except Exception as e:
-            print(f"\n✗ Error in cycle: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"\n✗ Error in cycle: {e}")
+
+    def _pin_trading_thread(self):
+        """Pin the calling (trading) thread to its core and raise its priority.
+
+        Best effort: raising priority needs CAP_SYS_NICE, and failures only
+        print a warning.
+        """
+        self._worker_nice = os.getpriority(os.PRIO_PROCESS, 0)
+
+        try:
+            os.sched_setaffinity(threading.get_native_id(), {self.trading_cpu})
+            print(f"✓ Trading thread pinned to CPU {self.trading_cpu}")
+        except OSError as e:
+            print(f"⚠️  Could not pin trading thread to CPU {self.trading_cpu}: {e}")
+
+        try:
+            os.nice(-10)
+            print(f"✓ Trading priority raised (nice -10)")
+        except OSError as e:
+            print(f"⚠️  Could not raise trading priority: {e}")
+
+    def _unpin_worker_thread(self):
+        """Pool initializer: undo the trading thread's pinning in a worker it spawns.
+
+        Pool workers start lazily from the trading thread and inherit its
+        core and raised priority; background work (history saves) should run
+        on the remaining cores at normal priority instead.
+        """
+        tid = threading.get_native_id()
+        if self._worker_cpus is not None:
+            try:
+                os.sched_setaffinity(tid, self._worker_cpus)
+            except OSError:
+                pass
+        if self._worker_nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, self._worker_nice)
+            except OSError:
+                pass
 
     def print_session_stats(self):
         """Print session statistics."""
@@ -262,6 +387,8 @@ class VolumeSpikeBot:
         print(f"Cycles Run: {self.check_count}")
         print(f"Volume Spikes Detected: {self.spikes_detected}")
         print(f"Trades Executed: {self.trades_executed}")
+        print(f"Market Cache Hit Rate: {self.feed.cache_hit_rate:.0%} "
+              f"({self.feed.hits}/{self.feed.hits + self.feed.misses})")
 
         if self.paper_trading and hasattr(self.trader, 'get_performance_summary'):
             stats = self.trader.get_performance_summary()
@@ -289,6 +416,11 @@ class VolumeSpikeBot:
         print(f"Press Ctrl+C to stop")
         print(f"{'='*70}\n")
 
+        self.feed.start()
+
+        if self.trading_cpu is not None:
+            self._pin_trading_thread()
+
         try:
             cycle = 0
             while True:
@@ -300,14 +432,16 @@ class VolumeSpikeBot:
                 # Print stats
                 self.print_session_stats()
 
-                # Save volume history
-                self.detector.save_history()
+                # Save volume history (written in the background)
+                self.detector.save_history_async()
 
                 cycle += 1
 
                 if continuous or (num_cycles and cycle < num_cycles):
-                    print(f"Waiting {self.check_interval}s before next cycle...\n")
-                    time.sleep(self.check_interval)
+                    # Start the next cycle as soon as the feed lands a fresh
+                    # snapshot rather than sleeping a fixed interval
+                    logger.info("Waiting up to %ss for next market snapshot...\n", self.check_interval)
+                    self.feed.wait_for_update(timeout=self.check_interval)
                 else:
                     break
 
@@ -318,6 +452,7 @@ class VolumeSpikeBot:
             self.print_session_stats()
 
         # Final cleanup
+        self.feed.stop()
         self.detector.save_history()
 
         if self.paper_trading and self.trader.session.open_positions:
@@ -326,8 +461,97 @@ class VolumeSpikeBot:
             self.print_session_stats()
 
 
+class RepeatedErrorFilter(logging.Filter):
+    """
+    Drop repeats of the same logged exception within a time window.
+
+    An exception is identified by its type, message and raise site (the
+    innermost traceback frame), so the same failure logged from different
+    handlers still counts as one.
+
+    Applied on the queue handler, so a suppressed record never has its
+    traceback formatted or enqueued. The next record let through for that
+    error notes how many repeats were dropped.
+    """
+
+    def __init__(self, window: float = 60.0):
+        super().__init__()
+        self.window = window
+        self._last_seen: Dict[tuple, float] = {}
+        self._suppressed: Dict[tuple, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not record.exc_info or record.exc_info[0] is None:
+            return True
+
+        exc_type, exc, tb = record.exc_info
+        if tb is not None:
+            # Key on the frame that raised, not the logging call
+            while tb.tb_next is not None:
+                tb = tb.tb_next
+            site = (tb.tb_frame.f_code.co_filename, tb.tb_lineno)
+        else:
+            site = (record.pathname, record.lineno)
+        key = (site, exc_type, str(exc))
+        now = time.monotonic()
+
+        last = self._last_seen.get(key)
+        if last is not None and now - last < self.window:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return False
+
+        if len(self._last_seen) > 1000:
+            self._last_seen.clear()
+        self._last_seen[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} repeats in the last {self.window:.0f}s suppressed)"
+        return True
+
+
+def setup_logging(log_file: str = None) -> QueueListener:
+    """
+    Route log records through a queue to a background writer thread.
+
+    Callers only enqueue records; the listener writes them to a rotating
+    log file, and warnings and errors also go to stdout. Repeats of the same
+    exception are collapsed (see RepeatedErrorFilter).
+
+    Args:
+        log_file: Log file path (default: ./logs/bot.log next to this module)
+
+    Returns:
+        Started QueueListener (stop() it on shutdown to drain the queue)
+    """
+    if log_file is None:
+        log_file = os.path.join(os.path.dirname(__file__), 'logs', 'bot.log')
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+
+    file_handler = RotatingFileHandler(log_file, maxBytes=50_000_000, backupCount=3)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.WARNING)
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RepeatedErrorFilter())
+    root.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
 def main():
     """Run the volume spike bot."""
+    # Cycle details and trade reports (including the paper engine's) go to
+    # logs/bot.log via a background listener; stdout keeps the summaries
+    listener = setup_logging()
+
     print("\n" + "="*70)
     print("  POLYMARKET VOLUME SPIKE TRADING BOT")
     print("="*70)
@@ -358,11 +582,15 @@ def main():
         min_spike_ratio=3.0,  # 3x volume spike minimum
         min_volume_usd=50000,  # $50k minimum volume
         max_hours_to_deadline=72,  # Within 72 hours of deadline
-        check_interval=30  # Check every 30 seconds
+        check_interval=30,  # Check every 30 seconds
+        min_change_score=10.0  # Spike must be 10+ std devs over its baseline (0 = off)
     )
 
     # Run for 3 cycles to build history
-    bot.run(num_cycles=3, continuous=False)
+    try:
+        bot.run(num_cycles=3, continuous=False)
+    finally:
+        listener.stop()
 
     print(f"\n{'='*70}")
     print("BOT SESSION COMPLETE")
@@ -9,25 +9,49 @@ Strategy: Detect sudden volume spikes in markets near deadline
 
 Key Insight: Volume spikes near deadline often signal insider info or imminent resolution
 """
+import math
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import defaultdict
+from itertools import accumulate
 import os
+import sys
+from array import array
 
 try:
+    from polymarket import fast_json
     from polymarket.gamma_client import GammaClient
     from polymarket.clob_client import ClobClient
 except ImportError:
+    import fast_json
     from gamma_client import GammaClient
     from clob_client import ClobClient
 
 
-@dataclass
+# prepare_markets() row: (market_id, volume_24h, price, liquidity,
+# end_date_iso, token_id, outcome, slug)
+PreparedMarket = Tuple[str, float, float, float, Optional[str], Optional[str], Optional[str], str]
+
+def _as_float(value, default: float) -> float:
+    """Coerce an API number (float, int, numeric string) to float; default if missing or invalid."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return value if math.isfinite(value) else default
+
+
+# Deadline cache miss marker (None is cached for unparseable dates)
+_UNPARSED = object()
+
+
+@dataclass(slots=True, frozen=True)
 class VolumeSnapshot:
-    """Single volume observation for a market."""
+    """Single volume observation for a market (read-only view of history)."""
     timestamp: datetime
     volume_24h: float  # USD volume in last 24h
     price: float
@@ -70,7 +94,13 @@ class VolumeSpike:
 
 
 class VolumeHistory:
-    """Track volume history for a single market."""
+    """
+    Track volume history for a single market.
+
+    Snapshots are stored column-wise in parallel typed arrays, oldest first,
+    instead of as one VolumeSnapshot object each; the `snapshots` property
+    rebuilds the objects on demand.
+    """
 
     def __init__(self, market_id: str, window_size: int = 20):
         """
@@ -80,29 +110,87 @@ class VolumeHistory:
         """
         self.market_id = market_id
         self.window_size = window_size
-        self.snapshots: deque[VolumeSnapshot] = deque(maxlen=window_size)
-
-    def add_snapshot(self, volume_24h: float, price: float, liquidity: float):
-        """Add new volume observation."""
-        snapshot = VolumeSnapshot(
-            timestamp=datetime.now(),
-            volume_24h=volume_24h,
-            price=price,
-            liquidity=liquidity
-        )
-        self.snapshots.append(snapshot)
+        self._ts = array('q')  # epoch nanoseconds
+        self._volume = array('d')
+        self._price = array('d')
+        self._liquidity = array('d')
+        self._volume_sum = 0.0  # running sum of _volume
+        self.unsaved = 0  # snapshots added since last journaled (see take_unsaved)
+
+    def __len__(self) -> int:
+        return len(self._volume)
+
+    @property
+    def snapshots(self) -> List[VolumeSnapshot]:
+        """Snapshots as VolumeSnapshot objects, oldest first (built per call)."""
+        return [
+            VolumeSnapshot(
+                timestamp=datetime.fromtimestamp(ts / 1e9),
+                volume_24h=volume_24h,
+                price=price,
+                liquidity=liquidity
+            )
+            for ts, volume_24h, price, liquidity
+            in zip(self._ts, self._volume, self._price, self._liquidity)
+        ]
+
+    def add_snapshot(self, volume_24h: float, price: float, liquidity: float,
+                     timestamp_ns: int = None):
+        """
+        Add new volume observation.
+
+        Args:
+            timestamp_ns: Observation time in epoch nanoseconds (default: now)
+        """
+        # Drop the oldest snapshot once the window is full
+        if len(self._volume) == self.window_size:
+            self._volume_sum -= self._volume[0]
+            del self._ts[0]
+            del self._volume[0]
+            del self._price[0]
+            del self._liquidity[0]
+
+        self._ts.append(time.time_ns() if timestamp_ns is None else timestamp_ns)
+        self._volume.append(volume_24h)
+        self._price.append(price)
+        self._liquidity.append(liquidity)
+        self._volume_sum += volume_24h
+        self.unsaved += 1
+
+    def take_unsaved(self) -> List[Tuple[int, float, float, float]]:
+        """
+        Snapshots added since the last call (at most the whole window).
+
+        Returns:
+            List of (timestamp_ns, volume_24h, price, liquidity), oldest first
+        """
+        n = min(self.unsaved, len(self._volume))
+        self.unsaved = 0
+        if not n:
+            return []
+        return list(zip(self._ts[-n:], self._volume[-n:], self._price[-n:], self._liquidity[-n:]))
+
+    def columns(self) -> Tuple[array, array, array, array]:
+        """Copies of the (timestamp_ns, volume_24h, price, liquidity) arrays."""
+        return self._ts[:], self._volume[:], self._price[:], self._liquidity[:]
 
     def get_avg_volume(self) -> float:
         """Calculate average volume over history."""
-        if not self.snapshots:
+        if not self._volume:
             return 0.0
-        return sum(s.volume_24h for s in self.snapshots) / len(self.snapshots)
+        return self._volume_sum / len(self._volume)
 
     def get_current_volume(self) -> float:
         """Get most recent volume."""
-        if not self.snapshots:
+        if not self._volume:
             return 0.0
-        return self.snapshots[-1].volume_24h
+        return self._volume[-1]
+
+    def get_last_timestamp_ns(self) -> Optional[int]:
+        """Get most recent observation time (epoch ns)."""
+        if not self._ts:
+            return None
+        return self._ts[-1]
 
     def get_volume_spike_ratio(self) -> float:
         """Calculate current volume vs historical average."""
@@ -112,21 +200,89 @@ class VolumeHistory:
             return 1.0
         return current / avg
 
-    def get_price_change(self, hours: float = 1.0) -> float:
-        """Calculate price change over last N hours."""
-        if len(self.snapshots) < 2:
+    def get_change_point_score(self, max_new: int = 3) -> float:
+        """
+        Score how large an upward shift the newest readings make.
+
+        Only the splits that put the newest 1..max_new readings on the right
+        are scored. For split t the L2 discrepancy is weighted by the shorter
+        segment, (right_mean - left_mean)**2 * min(t, n - t), and divided by
+        the variance of the older readings; the score is its square root,
+        i.e. the shift in baseline standard deviations. A jump over a steady
+        baseline scores high, the same jump over a volatile one scores low.
+
+        Normalizing by the baseline's spread rather than by the median
+        discrepancy over all splits keeps the score tied to the size of the
+        shift: the median version ranked an accelerating spike below a
+        noisy one. 24h volume is a rolling figure that moves slowly between
+        snapshots, so genuine 3x+ jumps score far above the default gate of
+        10 (VolumeSpikeDetector.min_change_score), while ratio spikes within
+        ten standard deviations of the baseline's own swings are rejected.
+
+        Returns:
+            Highest score over those splits where the newest readings are
+            higher (0.0 if none; inf over a perfectly flat baseline)
+
+        Examples:
+            >>> def score(volumes):
+            ...     history = VolumeHistory('m', window_size=len(volumes))
+            ...     for volume in volumes:
+            ...         history.add_snapshot(volume, 0.5, 0.0)
+            ...     return round(history.get_change_point_score(), 2)
+            >>> score([60e3, 61e3, 59e3, 60e3, 300e3, 900e3])  # accelerating spike
+            1080.0
+            >>> score([60e3, 60e3, 60e3, 60e3, 300e3, 900e3])  # same, flat baseline
+            inf
+            >>> score([60e3, 10e3, 90e3, 20e3, 70e3, 300e3])  # noisy baseline, under 10
+            8.24
+            >>> score([300e3, 900e3, 60e3, 60e3, 60e3, 60e3])  # spike already over
+            0.0
+        """
+        n = len(self._volume)
+        if n < 3:
             return 0.0
 
-        now = datetime.now()
-        cutoff = now - timedelta(hours=hours)
+        prefix = list(accumulate(self._volume, initial=0.0))
+        prefix_sq = list(accumulate((v * v for v in self._volume), initial=0.0))
+        total = prefix[n]
+
+        best = 0.0
+        for t in range(max(2, n - max_new), n):
+            left_mean = prefix[t] / t
+            right_mean = (total - prefix[t]) / (n - t)
+            if right_mean <= left_mean:
+                continue
+            left_var = prefix_sq[t] / t - left_mean * left_mean
+            if left_var <= 0:
+                return math.inf
+            discrepancy = (right_mean - left_mean) ** 2 * min(t, n - t)
+            score = math.sqrt(discrepancy / left_var)
+            if score > best:
+                best = score
+        return best
+
+    def get_price_change(self, hours: float = 1.0, now_ns: int = None) -> float:
+        """
+        Calculate price change over last N hours.
 
-        # Get snapshots within time window
-        recent = [s for s in self.snapshots if s.timestamp >= cutoff]
-        if len(recent) < 2:
+        Args:
+            now_ns: Current time in epoch nanoseconds (default: now)
+        """
+        n = len(self._ts)
+        if n < 2:
+            return 0.0
+
+        if now_ns is None:
+            now_ns = time.time_ns()
+        cutoff = now_ns - int(hours * 3_600_000_000_000)
+
+        # First snapshot within time window (timestamps are ascending)
+        first = bisect_left(self._ts, cutoff)
+        if n - first < 2:
             return 0.0
 
-        old_price = recent[0].price
-        new_price = recent[-1].price
+        old_price = self._price[first]
+        new_price = self._price[-1]
 
         if old_price == 0:
             return 0.0
@@ -134,7 +290,7 @@ class VolumeHistory:
 
     def has_sufficient_history(self, min_snapshots: int = 5) -> bool:
         """Check if we have enough history for reliable detection."""
-        return len(self.snapshots) >= min_snapshots
+        return len(self._volume) >= min_snapshots
 
 
 class VolumeSpikeDetector:
@@ -155,7 +311,8 @@ class VolumeSpikeDetector:
                  min_volume_usd: float = 50000,
                  max_hours_to_deadline: float = 72,
                  history_window: int = 20,
-                 data_dir: str = None):
+                 data_dir: str = None,
+                 min_change_score: float = 10.0):
         """
         Args:
             min_spike_ratio: Minimum volume spike to detect (e.g., 3.0 = 3x increase)
@@ -163,10 +320,21 @@ class VolumeSpikeDetector:
             max_hours_to_deadline: Only consider markets within N hours of deadline
             history_window: Number of snapshots to track per market
             data_dir: Directory to persist volume history
+            min_change_score: Minimum change-point score (shift of the newest
+                readings in baseline standard deviations, see
+                VolumeHistory.get_change_point_score) confirming the spike is
+                a shift, not noise (0 = off)
         """
         self.min_spike_ratio = min_spike_ratio
+        self.min_change_score = min_change_score
         self.min_volume_usd = min_volume_usd
         self.max_hours_to_deadline = max_hours_to_deadline
+
+        # Markets resolving within this many hours get a baseline history
+        # even at low volume, so it is ready when they enter the deadline
+        # window; histories beyond twice this are evicted. Callers that
+        # prefilter markets by deadline should use the same horizon
+        self.tracking_horizon_hours = 2 * max_hours_to_deadline
         self.history_window = history_window
 
         # Data directory
@@ -186,6 +354,27 @@ class VolumeSpikeDetector:
         self.gamma = GammaClient()
         self.clob = ClobClient()
 
+        # ISO end date -> epoch seconds (None if unparseable)
+        self._deadline_cache: Dict[str, Optional[float]] = {}
+
+        # Listed markets with a parseable deadline, sorted by end
+        # timestamp (parallel lists kept in order with bisect), so each scan
+        # can find the ones inside the deadline window with one range lookup
+        self._deadline_keys: List[float] = []
+        self._deadline_ids: List[str] = []
+        # Per listed market: end-date string it was indexed under (also the
+        # "seen" set) and its parsed end timestamp
+        self._deadline_iso: Dict[str, Optional[str]] = {}
+        self._deadline_of: Dict[str, Optional[float]] = {}
+
+        # Background persistence (see save_history_async)
+        self._save_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_save: Optional[Future] = None
+        self._journal_lines = 0  # snapshots in journal.jsonl since last compaction
+        # Runs once in the save worker thread when it starts (e.g. to undo
+        # CPU pinning/priority inherited from the thread that spawned it)
+        self.save_thread_initializer: Optional[Callable[[], None]] = None
+
         # Load persisted history
         self._load_history()
 
@@ -196,77 +385,231 @@ class VolumeSpikeDetector:
         print(f"Min Volume: ${min_volume_usd:,.0f}")
         print(f"Max Hours to Deadline: {max_hours_to_deadline}h")
         print(f"History Window: {history_window} snapshots")
+        print(f"Min Change Score: {min_change_score}")
         print(f"{'='*70}\n")
 
-    def update_volume_history(self, markets: List[Dict]):
-        """Update volume history for all markets."""
-        for market in markets:
-            market_id = market.get('id', market.get('condition_id', 'unknown'))
+    @staticmethod
+    def prepare_markets(markets: List[Dict]) -> List[PreparedMarket]:
+        """
+        Extract every field the detector reads from each market once.
 
-            # Get volume (may need to fetch from Gamma or estimate from CLOB)
-            volume_24h = market.get('volume', 0)
+        Returns:
+            List of (market_id, volume_24h, price, liquidity, end_date_iso,
+            token_id, outcome, slug) tuples, suitable for detect_spikes() and
+            repeated update_volume_history_fast() calls. token_id is None
+            when the market has no tokens. Closed and archived markets are
+            dropped here, before any other work.
+        """
+        prepared = []
+        for market in markets:
+            if market.get('closed') or market.get('archived'):
+                continue
 
-            # Get current price
+            market_id = market.get('id', market.get('condition_id', 'unknown'))
+            if type(market_id) is str:
+                # One shared object per id across refreshes, so history and
+                # deadline-index lookups match on identity instead of
+                # comparing long condition-id strings
+                market_id = sys.intern(market_id)
+
+            # Get volume (may need to fetch from Gamma or estimate from CLOB).
+            # Numbers are coerced here because the history stores them in
+            # float arrays; Gamma can send None or numeric strings
+            volume_24h = _as_float(market.get('volume'), 0.0)
+
+            # Get current price, token and outcome from the first token
             tokens = market.get('tokens', [])
-            if tokens and len(tokens) > 0:
-                # Use first token's price if available
-                price = tokens[0].get('price', 0.5)
+            if tokens:
+                token = tokens[0]
+                price = _as_float(token.get('price'), 0.5)
+                token_id = token.get('token_id', 'unknown')
+                outcome = token.get('outcome', 'Yes')
             else:
                 # Default to 0.5 (mid-point) if no price data
                 price = 0.5
+                token_id = None
+                outcome = None
+
+            liquidity = _as_float(market.get('liquidity'), 0.0)
+            # CLOB markets carry end_date_iso, raw Gamma endDate, and
+            # GammaClient's normalized dicts end_time
+            end_date_iso = market.get('end_date_iso') or market.get('endDate') or market.get('end_time')
+            slug = market.get('slug', market.get('question', 'unknown'))
+
+            prepared.append((market_id, volume_24h, price, liquidity,
+                             end_date_iso, token_id, outcome, slug))
 
-            liquidity = market.get('liquidity', 0)
+        return prepared
 
+    def update_volume_history(self, markets: List[Dict]):
+        """Update volume history for all markets."""
+        self.update_volume_history_fast(self.prepare_markets(markets))
+
+    def update_volume_history_fast(self, prepared: List[PreparedMarket]):
+        """Update volume history from prepare_markets() output."""
+        volume_history = self.volume_history
+        deadline_of = self._deadline_of
+        now_ts = time.time()
+        self._index_deadlines(prepared)
+        for market_id, volume_24h, price, liquidity, *_ in prepared:
             # Get or create history tracker
-            if market_id not in self.volume_history:
-                self.volume_history[market_id] = VolumeHistory(
+            history = volume_history.get(market_id)
+            if history is None:
+                if not self._worth_tracking(volume_24h, deadline_of[market_id], now_ts):
+                    continue
+                history = volume_history[market_id] = VolumeHistory(
                     market_id=market_id,
                     window_size=self.history_window
                 )
 
             # Add snapshot
-            self.volume_history[market_id].add_snapshot(
+            history.add_snapshot(
                 volume_24h=volume_24h,
                 price=price,
                 liquidity=liquidity
             )
 
-    def calculate_deadline_proximity(self, end_date_iso: str) -> Tuple[float, float]:
+    def parse_deadline(self, end_date_iso: Optional[str]) -> Optional[float]:
+        """
+        Market end date as epoch seconds (None if missing or unparseable).
+
+        Naive timestamps are taken as UTC. Results are cached per string, so
+        callers can use this for every market on every scan.
+        """
+        if not end_date_iso:
+            return None
+
+        # End dates never change: parse each ISO string once (None = unparseable)
+        end_ts = self._deadline_cache.get(end_date_iso, _UNPARSED)
+        if end_ts is _UNPARSED:
+            try:
+                end_date = datetime.fromisoformat(end_date_iso.replace('Z', '+00:00'))
+                if end_date.tzinfo is None:
+                    end_date = end_date.replace(tzinfo=timezone.utc)
+                end_ts = end_date.timestamp()
+            except Exception as e:
+                print(f"  Warning: Could not parse deadline: {e}")
+                end_ts = None
+            self._deadline_cache[end_date_iso] = end_ts
+        return end_ts
+
+    def _index_deadlines(self, prepared: List[PreparedMarket]):
+        """Insert new markets, and markets whose end date changed, into the sorted deadline index."""
+        deadline_iso = self._deadline_iso
+        deadline_of = self._deadline_of
+        for row in prepared:
+            market_id, end_date_iso = row[0], row[4]
+            if deadline_iso.get(market_id, _UNPARSED) == end_date_iso:
+                continue
+            if market_id in deadline_iso:
+                self._unindex_deadline(market_id)  # End date moved
+            deadline_iso[market_id] = end_date_iso
+            end_ts = deadline_of[market_id] = self.parse_deadline(end_date_iso)
+            if end_ts is None:
+                continue  # No deadline: never inside the window
+            i = bisect_right(self._deadline_keys, end_ts)
+            self._deadline_keys.insert(i, end_ts)
+            self._deadline_ids.insert(i, market_id)
+
+    def _unindex_deadline(self, market_id: str):
+        """Remove a market's entry from the sorted deadline index, if still there."""
+        end_ts = self._deadline_of.get(market_id)
+        if end_ts is None:
+            return
+        keys = self._deadline_keys
+        for i in range(bisect_left(keys, end_ts), bisect_right(keys, end_ts)):
+            if self._deadline_ids[i] == market_id:
+                del keys[i]
+                del self._deadline_ids[i]
+                return
+
+    def _deadline_window(self, now_ts: float) -> set:
+        """
+        Ids of markets resolving by now + max_hours_to_deadline.
+
+        Past-due markets that are still listed stay in the window (they
+        score full deadline proximity); the index only shrinks as markets
+        stop being listed (see _forget_unlisted_deadlines).
+        """
+        keys = self._deadline_keys
+        return set(self._deadline_ids[:bisect_right(keys, now_ts + self.max_hours_to_deadline * 3600)])
+
+    def _forget_unlisted_deadlines(self, prepared: List[PreparedMarket]):
+        """Drop deadline entries of markets no longer listed (full scans only)."""
+        listed = {row[0] for row in prepared}
+        for market_id in [m for m in self._deadline_iso if m not in listed]:
+            self._unindex_deadline(market_id)
+            del self._deadline_iso[market_id]
+            del self._deadline_of[market_id]
+
+    def _worth_tracking(self, volume_24h: float, end_ts: Optional[float], now_ts: float) -> bool:
+        """
+        Whether a market without history should get one yet.
+
+        Lenient on purpose, so the baseline is built before the market can
+        qualify: half the minimum volume, or resolving within the tracking
+        horizon.
+        """
+        if volume_24h >= self.min_volume_usd * 0.5:
+            return True
+        return end_ts is not None and end_ts <= now_ts + self.tracking_horizon_hours * 3600
+
+    def _evict_idle_history(self, now_ts: float):
+        """
+        Drop histories of markets well outside both thresholds.
+
+        Stricter than _worth_tracking() (under half the minimum volume and
+        resolving beyond twice the tracking horizon, or unknown), so an
+        evicted market isn't recreated on the next scan.
+        """
+        deadline_of = self._deadline_of
+        min_volume = self.min_volume_usd * 0.5
+        far_ts = now_ts + self.tracking_horizon_hours * 2 * 3600
+        idle = []
+        for market_id, history in self.volume_history.items():
+            if history.get_current_volume() >= min_volume:
+                continue
+            end_ts = deadline_of.get(market_id)
+            if end_ts is None or end_ts > far_ts:
+                idle.append(market_id)
+        for market_id in idle:
+            del self.volume_history[market_id]
+
+    def calculate_deadline_proximity(self, end_date_iso: str, now_ts: float = None) -> Tuple[float, float]:
         """
         Calculate hours to deadline and proximity score.
 
+        Args:
+            end_date_iso: Market end date (ISO 8601)
+            now_ts: Current time in epoch seconds (default: now)
+
         Returns:
             (hours_to_deadline, proximity_score)
             proximity_score: 0-100, higher = closer to deadline
         """
-        if not end_date_iso:
+        end_ts = self.parse_deadline(end_date_iso)
+        if end_ts is None:
             return (999999.0, 0.0)
 
-        try:
-            # Parse ISO date
-            end_date = datetime.fromisoformat(end_date_iso.replace('Z', '+00:00'))
-            now = datetime.now(end_date.tzinfo)
-
-            # Calculate hours remaining
-            hours_remaining = (end_date - now).total_seconds() / 3600
-
-            # Proximity score: 100 at deadline, decreases linearly
-            if hours_remaining <= 0:
-                proximity_score = 100.0
-            elif hours_remaining >= self.max_hours_to_deadline:
-                proximity_score = 0.0
-            else:
-                # Linear interpolation: 0h=100, max_hours=0
-                proximity_score = 100 * (1 - (hours_remaining / self.max_hours_to_deadline))
+        if now_ts is None:
+            now_ts = time.time()
 
-            return (hours_remaining, proximity_score)
+        # Calculate hours remaining
+        hours_remaining = (end_ts - now_ts) / 3600
 
-        except Exception as e:
-            print(f"  Warning: Could not parse deadline: {e}")
-            return (999999.0, 0.0)
+        # Proximity score: 100 at deadline, decreases linearly
+        if hours_remaining <= 0:
+            proximity_score = 100.0
+        elif hours_remaining >= self.max_hours_to_deadline:
+            proximity_score = 0.0
+        else:
+            # Linear interpolation: 0h=100, max_hours=0
+            proximity_score = 100 * (1 - (hours_remaining / self.max_hours_to_deadline))
+
+        return (hours_remaining, proximity_score)
 
-    def calculate_signal_strength(self,
-                                  volume_spike_ratio: float,
+    @staticmethod
+    def calculate_signal_strength(volume_spike_ratio: float,
                                   price_change_1h: float,
                                   deadline_proximity: float) -> float:
         """
@@ -282,68 +625,133 @@ class VolumeSpikeDetector:
         """
         # Volume component (0-40 points)
         # 3x spike = 10, 5x = 25, 10x = 40
-        volume_score = min(40, (volume_spike_ratio - 1) * 8)
+        volume_score = (volume_spike_ratio - 1) * 8
+        if volume_score > 40:
+            volume_score = 40
 
         # Price movement component (0-30 points)
         # Absolute price change: 5% = 15, 10% = 30
-        price_score = min(30, abs(price_change_1h) * 3)
+        price_score = abs(price_change_1h) * 3
+        if price_score > 30:
+            price_score = 30
 
         # Deadline proximity component (0-30 points)
         deadline_score = deadline_proximity * 0.3
 
         total = volume_score + price_score + deadline_score
-        return min(100, total)
+        return total if total < 100 else 100
 
-    def detect_spikes(self, markets: List[Dict]) -> List[VolumeSpike]:
+    def detect_spikes(self, markets: List[Dict], full_scan: bool = True) -> List[VolumeSpike]:
         """
         Scan markets for volume spikes.
 
         Args:
             markets: List of market dicts from CLOB/Gamma
+            full_scan: If False, only markets whose volume moved since their
+                previous snapshot are tested (every market's history is still
+                updated)
 
         Returns:
-            List of detected volume spike opportunities
+            List of detected volume spike opportunities (unordered; callers
+            pick the strongest with heapq.nlargest or sort as needed)
+
+        Examples:
+            Both series below end in a ratio spike over min_spike_ratio; the
+            change-point gate keeps the one over a steady baseline and turns
+            away the one over a noisy baseline:
+
+            >>> import contextlib, io, tempfile
+            >>> def spiking(min_change_score):
+            ...     with contextlib.redirect_stdout(io.StringIO()):
+            ...         detector = VolumeSpikeDetector(data_dir=tempfile.mkdtemp(),
+            ...                                        min_change_score=min_change_score)
+            ...     series = {'steady': [60e3, 61e3, 59e3, 60e3, 61e3, 320e3],
+            ...               'noisy': [60e3, 10e3, 90e3, 20e3, 70e3, 300e3]}
+            ...     end = datetime.now(timezone.utc).isoformat()
+            ...     for i in range(6):
+            ...         spikes = detector.detect_spikes([
+            ...             {'id': market_id, 'volume': volumes[i], 'endDate': end,
+            ...              'tokens': [{'price': 0.3 + 0.03 * i, 'token_id': market_id}]}
+            ...             for market_id, volumes in series.items()
+            ...         ])
+            ...     return sorted(spike.market_id for spike in spikes)
+            >>> spiking(min_change_score=0)
+            ['noisy', 'steady']
+            >>> spiking(min_change_score=10)
+            ['steady']
         """
-        # Update volume history first
-        self.update_volume_history(markets)
-
-        spikes = []
+        volume_history = self.volume_history
+        window_size = self.history_window
+        min_spike_ratio = self.min_spike_ratio
+        min_volume_usd = self.min_volume_usd
 
-        for market in markets:
-            market_id = market.get('id', market.get('condition_id', 'unknown'))
+        # One clock read per scan, shared by every snapshot and calculation
+        now_ns = time.time_ns()
+        now_ts = now_ns / 1e9
+        detected_at = datetime.fromtimestamp(now_ts)
 
-            # Skip if no history yet
-            if market_id not in self.volume_history:
-                continue
+        prepared = self.prepare_markets(markets)
 
-            history = self.volume_history[market_id]
+        # Deadline window as a range lookup on the sorted index
+        self._index_deadlines(prepared)
+        deadline_of = self._deadline_of
+        in_window = self._deadline_window(now_ts)
 
-            # Need sufficient history for reliable detection
-            if not history.has_sufficient_history(min_snapshots=5):
-                continue
+        spikes = []
 
-            # Get volume spike ratio
-            spike_ratio = history.get_volume_spike_ratio()
+        # Single pass over pre-extracted tuples: update each market's history
+        # and screen it in the same iteration, so no market dict is touched
+        # again after prepare_markets()
+        for (market_id, volume_24h, price, liquidity,
+             end_date, token_id, outcome, slug) in prepared:
+            history = volume_history.get(market_id)
+            if history is None:
+                # Lazily allocated: most markets never come near qualifying
+                if not self._worth_tracking(volume_24h, deadline_of[market_id], now_ts):
+                    continue
+                history = volume_history[market_id] = VolumeHistory(
+                    market_id=market_id,
+                    window_size=window_size
+                )
+            moved = history.get_current_volume() != volume_24h
+            history.add_snapshot(
+                volume_24h=volume_24h,
+                price=price,
+                liquidity=liquidity,
+                timestamp_ns=now_ns
+            )
 
-            # Filter: Must exceed minimum spike threshold
-            if spike_ratio < self.min_spike_ratio:
+            # Between full scans only react to markets whose volume moved
+            if not (full_scan or moved):
                 continue
 
-            # Filter: Minimum absolute volume
-            current_volume = history.get_current_volume()
-            if current_volume < self.min_volume_usd:
+            # Cheapest rejections first, all on values already in hand:
+            # outside the deadline window (history is still updated above so
+            # the baseline is ready when the market gets close), below the
+            # minimum absolute volume, nothing to trade, too little history
+            if market_id not in in_window or volume_24h < min_volume_usd:
+                continue
+            if token_id is None or len(history) < 5:
                 continue
 
-            # Get deadline info
-            end_date = market.get('end_date_iso', market.get('endDate'))
-            hours_to_deadline, deadline_proximity = self.calculate_deadline_proximity(end_date)
+            # Spike ratio against the running average. Most markets stop
+            # here, so nothing else is computed for them
+            avg_volume = history.get_avg_volume()
+            spike_ratio = volume_24h / avg_volume if avg_volume else 1.0
+            if spike_ratio < min_spike_ratio:
+                continue
+            current_volume = volume_24h
 
-            # Filter: Too far from deadline
-            if hours_to_deadline > self.max_hours_to_deadline:
+            # Filter: Confirm the jump is a change point in the volume series
+            # rather than one noisy reading against a volatile baseline
+            if self.min_change_score and history.get_change_point_score() < self.min_change_score:
                 continue
 
+            # Get deadline info (inside the window, checked above)
+            hours_to_deadline, deadline_proximity = self.calculate_deadline_proximity(end_date, now_ts)
+
             # Get price change
-            price_change_1h = history.get_price_change(hours=1.0)
+            price_change_1h = history.get_price_change(hours=1.0, now_ns=now_ns)
 
             # Calculate signal strength
             signal_strength = self.calculate_signal_strength(
@@ -356,13 +764,7 @@ class VolumeSpikeDetector:
             if signal_strength < 50:
                 continue
 
-            # Get market details
-            tokens = market.get('tokens', [])
-            if not tokens:
-                continue
-
-            token = tokens[0]
-            current_price = token.get('price', 0.5)
+            current_price = price
 
             # Calculate position sizing
             # More aggressive sizing for stronger signals
@@ -380,62 +782,114 @@ class VolumeSpikeDetector:
                 expected_roi = ((current_price - 0.0) / (1.0 - current_price)) * 100
 
             # Build reasoning
-            reasoning = f"Volume spike {spike_ratio:.1f}x (${current_volume:,.0f} vs ${history.get_avg_volume():,.0f} avg). "
-            reasoning += f"Price {'up' if price_change_1h > 0 else 'down'} {abs(price_change_1h):.1f}% in 1h. "
-            reasoning += f"Deadline in {hours_to_deadline:.1f}h (proximity: {deadline_proximity:.0f}/100). "
-            reasoning += f"Signal strength: {signal_strength:.0f}/100"
+            reasoning = (
+                f"Volume spike {spike_ratio:.1f}x (${current_volume:,.0f} vs ${avg_volume:,.0f} avg). "
+                f"Price {'up' if price_change_1h > 0 else 'down'} {abs(price_change_1h):.1f}% in 1h. "
+                f"Deadline in {hours_to_deadline:.1f}h (proximity: {deadline_proximity:.0f}/100). "
+                f"Signal strength: {signal_strength:.0f}/100"
+            )
 
             spike = VolumeSpike(
                 market_id=market_id,
-                market_slug=market.get('slug', market.get('question', 'unknown'))[:80],
-                token_id=token.get('token_id', 'unknown'),
-                outcome=token.get('outcome', 'Yes'),
+                market_slug=slug[:80],
+                token_id=token_id,
+                outcome=outcome,
                 current_volume_24h=current_volume,
-                avg_volume_24h=history.get_avg_volume(),
+                avg_volume_24h=avg_volume,
                 volume_spike_ratio=spike_ratio,
                 current_price=current_price,
                 price_change_1h=price_change_1h,
                 hours_to_deadline=hours_to_deadline,
                 deadline_proximity_score=deadline_proximity,
                 signal_strength=signal_strength,
-                confidence=min(100, len(history.snapshots) * 5),  # More history = higher confidence
+                confidence=min(100, len(history) * 5),  # More history = higher confidence
                 recommended_position_usd=recommended_position,
                 max_loss_usd=max_loss,
                 expected_roi_percent=expected_roi,
-                detection_timestamp=datetime.now(),
+                detection_timestamp=detected_at,
                 reasoning=reasoning
             )
 
             spikes.append(spike)
 
-        # Sort by signal strength
-        spikes.sort(key=lambda s: s.signal_strength, reverse=True)
+        if full_scan:
+            self._forget_unlisted_deadlines(prepared)
+            self._evict_idle_history(now_ts)
 
         return spikes
 
     def _load_history(self):
-        """Load persisted volume history from disk."""
+        """
+        Load persisted volume history from disk.
+
+        Reads the compacted volume_history.json, then replays journal.jsonl
+        (snapshots appended since the last compaction) on top of it.
+        """
         history_file = os.path.join(self.data_dir, 'volume_history.json')
-        if not os.path.exists(history_file):
+        journal_file = os.path.join(self.data_dir, 'journal.jsonl')
+        if not os.path.exists(history_file) and not os.path.exists(journal_file):
             return
 
         try:
-            with open(history_file, 'r') as f:
-                data = json.load(f)
-
-            for market_id, snapshots_data in data.items():
-                history = VolumeHistory(market_id, self.history_window)
-
-                for snap in snapshots_data:
-                    snapshot = VolumeSnapshot(
-                        timestamp=datetime.fromisoformat(snap['timestamp']),
-                        volume_24h=snap['volume_24h'],
-                        price=snap['price'],
-                        liquidity=snap['liquidity']
-                    )
-                    history.snapshots.append(snapshot)
-
-                self.volume_history[market_id] = history
+            if os.path.exists(history_file):
+                with open(history_file, 'rb') as f:
+                    data = fast_json.loads(f.read())
+
+                for market_id, snapshots_data in data.items():
+                    market_id = sys.intern(market_id)  # see prepare_markets
+                    history = VolumeHistory(market_id, self.history_window)
+
+                    for snap in snapshots_data:
+                        timestamp = snap['timestamp']
+                        if isinstance(timestamp, str):
+                            # Files written before timestamps were epoch ns
+                            timestamp = int(datetime.fromisoformat(timestamp).timestamp() * 1e9)
+                        history.add_snapshot(
+                            volume_24h=snap['volume_24h'],
+                            price=snap['price'],
+                            liquidity=snap['liquidity'],
+                            timestamp_ns=timestamp
+                        )
+
+                    self.volume_history[market_id] = history
+
+            if os.path.exists(journal_file):
+                with open(journal_file, 'r+b') as f:
+                    good_bytes = 0
+                    for line in f:
+                        try:
+                            if not line.endswith(b'\n'):
+                                raise ValueError('incomplete line')
+                            snap = fast_json.loads(line)
+                        except ValueError:
+                            # Torn last line from an interrupted write: cut it
+                            # off so the next append starts on a fresh line
+                            f.truncate(good_bytes)
+                            break
+                        good_bytes += len(line)
+
+                        market_id = sys.intern(snap['m'])
+                        history = self.volume_history.get(market_id)
+                        if history is None:
+                            history = self.volume_history[market_id] = VolumeHistory(market_id, self.history_window)
+
+                        # Already in the snapshot if compaction was interrupted
+                        # before the journal was cleared
+                        last_ts = history.get_last_timestamp_ns()
+                        if last_ts is not None and snap['t'] <= last_ts:
+                            continue
+
+                        history.add_snapshot(
+                            volume_24h=snap['v'],
+                            price=snap['p'],
+                            liquidity=snap['l'],
+                            timestamp_ns=snap['t']
+                        )
+                        self._journal_lines += 1
+
+            # Everything loaded is already on disk
+            for history in self.volume_history.values():
+                history.unsaved = 0
 
             print(f"✓ Loaded volume history for {len(self.volume_history)} markets")
 
@@ -443,30 +897,116 @@ class VolumeSpikeDetector:
             print(f"Warning: Could not load volume history: {e}")
 
     def save_history(self):
-        """Persist volume history to disk."""
-        history_file = os.path.join(self.data_dir, 'volume_history.json')
+        """Persist volume history to disk (full rewrite; clears the journal)."""
+        # Don't race a background save still writing the same files
+        if self._pending_save is not None:
+            self._pending_save.result()
 
         try:
-            data = {}
-            for market_id, history in self.volume_history.items():
-                snapshots_data = []
-                for snap in history.snapshots:
-                    snapshots_data.append({
-                        'timestamp': snap.timestamp.isoformat(),
-                        'volume_24h': snap.volume_24h,
-                        'price': snap.price,
-                        'liquidity': snap.liquidity
-                    })
-                data[market_id] = snapshots_data
-
-            with open(history_file, 'w') as f:
-                json.dump(data, f, indent=2)
-
+            self._take_unsaved()
+            self._journal_lines = 0
+            self._write_history(self._copy_history())
             print(f"✓ Saved volume history for {len(self.volume_history)} markets")
 
         except Exception as e:
             print(f"Warning: Could not save volume history: {e}")
 
+    def save_history_async(self) -> Future:
+        """
+        Persist volume history on a background thread.
+
+        Snapshots added since the last save are copied on the calling thread
+        and appended to journal.jsonl by a single worker, so saves never
+        overlap and each one writes only what is new. Once the journal holds
+        more snapshots than a full rewrite would, the whole history is
+        compacted into volume_history.json instead. If the previous save is
+        still running, no new one is queued (its snapshots go with the next).
+
+        Returns:
+            Future for the (pending or newly submitted) save
+        """
+        if self._pending_save is not None and not self._pending_save.done():
+            return self._pending_save
+
+        if self._save_executor is None:
+            self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='history-save',
+                                                     initializer=self.save_thread_initializer)
+
+        rows = self._take_unsaved()
+        self._journal_lines += len(rows)
+        if self._journal_lines > self.history_window * max(len(self.volume_history), 1):
+            self._journal_lines = 0
+            self._pending_save = self._save_executor.submit(self._write_history_safe, self._copy_history())
+        else:
+            self._pending_save = self._save_executor.submit(self._append_journal_safe, rows)
+        return self._pending_save
+
+    def _take_unsaved(self) -> List[Tuple[str, int, float, float, float]]:
+        """Collect (market_id, timestamp_ns, volume_24h, price, liquidity) rows not yet journaled."""
+        rows = []
+        for market_id, history in self.volume_history.items():
+            if history.unsaved:
+                for ts, volume_24h, price, liquidity in history.take_unsaved():
+                    rows.append((market_id, ts, volume_24h, price, liquidity))
+        return rows
+
+    def _copy_history(self) -> Dict[str, Tuple[array, array, array, array]]:
+        """Copy each market's snapshot columns (see VolumeHistory.columns)."""
+        return {market_id: history.columns() for market_id, history in self.volume_history.items()}
+
+    def _append_journal_safe(self, rows: List[Tuple[str, int, float, float, float]]):
+        """Background-save entry point: report errors instead of raising."""
+        try:
+            self._append_journal(rows)
+        except Exception as e:
+            print(f"Warning: Could not save volume history: {e}")
+
+    def _write_history_safe(self, history: Dict[str, Tuple[array, array, array, array]]):
+        """Background-save entry point: report errors instead of raising."""
+        try:
+            self._write_history(history)
+        except Exception as e:
+            print(f"Warning: Could not save volume history: {e}")
+
+    def _append_journal(self, rows: List[Tuple[str, int, float, float, float]]):
+        """Append snapshot rows to journal.jsonl, one JSON object per line."""
+        if not rows:
+            return
+        dumps = fast_json.dumps
+        with open(os.path.join(self.data_dir, 'journal.jsonl'), 'ab') as f:
+            f.write(b''.join(
+                dumps({'m': market_id, 't': ts, 'v': volume_24h, 'p': price, 'l': liquidity}) + b'\n'
+                for market_id, ts, volume_24h, price, liquidity in rows
+            ))
+
+    def _write_history(self, history: Dict[str, Tuple[array, array, array, array]]):
+        """Serialize copied history to volume_history.json and clear the journal."""
+        history_file = os.path.join(self.data_dir, 'volume_history.json')
+
+        data = {}
+        for market_id, (ts_col, volume_col, price_col, liquidity_col) in history.items():
+            snapshots_data = []
+            for ts, volume_24h, price, liquidity in zip(ts_col, volume_col, price_col, liquidity_col):
+                snapshots_data.append({
+                    'timestamp': ts,  # epoch ns
+                    'volume_24h': volume_24h,
+                    'price': price,
+                    'liquidity': liquidity
+                })
+            data[market_id] = snapshots_data
+
+        # Compact output: indent=2 roughly doubled the file for no reader's benefit.
+        # Written to a temp file and swapped in, so a crash mid-write leaves the
+        # previous snapshot (and the journal on top of it) intact
+        tmp_file = history_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(fast_json.dumps(data))
+        os.replace(tmp_file, history_file)
+
+        # The snapshot now covers everything journaled
+        journal_file = os.path.join(self.data_dir, 'journal.jsonl')
+        if os.path.exists(journal_file):
+            os.remove(journal_file)
 
 def main():
     """Test volume spike detector."""
@@ -489,19 +1029,16 @@ def main():
     print("Fetching markets...\n")
     markets = clob.get_simplified_markets()
 
-    # Filter for open markets
-    open_markets = [
-        m for m in markets
-        if not m.get('closed') and not m.get('archived')
-    ]
+    # Extract market fields once (closed/archived markets are dropped)
+    prepared = detector.prepare_markets(markets)
 
-    print(f"Found {len(open_markets)} open markets\n")
+    print(f"Found {len(prepared)} open markets\n")
 
     # Build history over multiple cycles
     print("Building volume history (3 cycles)...\n")
     for i in range(3):
         print(f"Cycle {i+1}/3...")
-        detector.update_volume_history(open_markets)
+        detector.update_volume_history_fast(prepared)
         if i < 2:
             time.sleep(5)  # Wait between snapshots
 
@@ -509,7 +1046,8 @@ def main():
 
     # Detect spikes
     print("Scanning for volume spikes...\n")
-    spikes = detector.detect_spikes(open_markets)
+    spikes = detector.detect_spikes(markets)
+    spikes.sort(key=lambda s: s.signal_strength, reverse=True)
 
     print(f"{'='*70}")
     print(f"DETECTED {len(spikes)} VOLUME SPIKES")